@@ -1,25 +1,52 @@
+import asyncio
 import hashlib
+import time
 from contextlib import asynccontextmanager
 from random import randbytes
 from typing import Callable
 
 from fastapi import FastAPI, Request
 
+from configs import configs
 from database import disconnect_db
-from routers import health_router, tasks_router
+from database.notifications import task_events
+from jobs import Worker
+from routers import health_router, metrics_router, tasks_router
+from routers.utils.admission import UploadAdmissionMiddleware
+from routers.utils.decompression import RequestDecompressionMiddleware
+from routers.utils.http_proxy import close_clients
+from routers.utils.readiness import readiness
 from service_logging import logger
+from service_metrics import http_request_duration
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # on_startup
     logger.info("FastAPI application starting up...")
+    task_events.start()
+    if configs.readiness.WARMUP:
+        await readiness.warm_up(
+            configs.readiness.WARMUP_DB_CONNECTIONS, configs.readiness.WARMUP_HTTP_CONNECTIONS
+        )
+    readiness.start()
+    worker, worker_task = None, None
+    if configs.worker.EMBEDDED:
+        worker = Worker(configs.worker.CONCURRENCY, configs.worker.POLL_INTERVAL)
+        worker_task = asyncio.create_task(worker.run())
 
     yield
 
     # on_shutdown
     logger.info("FastAPI application shutting down...")
+    if worker:
+        worker.stop()
+        await worker_task
+    await readiness.stop()
+    await task_events.stop()
+    await close_clients()
     await disconnect_db()
+    await logger.complete()
 
 
 service = FastAPI(lifespan=lifespan)
@@ -33,5 +60,29 @@ async def add_request_hash(request: Request, call_next: Callable):
         return response
 
 
+@service.middleware("http")
+async def measure_request(request: Request, call_next: Callable):
+    started_at = time.perf_counter()
+    response = await call_next(request)
+
+    route = request.scope.get("route")
+    http_request_duration.observe(
+        time.perf_counter() - started_at,
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status_code=response.status_code,
+    )
+    return response
+
+
+service.add_middleware(
+    RequestDecompressionMiddleware,
+    limit=configs.storage.MAX_DECOMPRESSED_SIZE,
+    chunk_size=configs.storage.CHUNK_SIZE,
+)
+# * Добавляется последним, чтобы слот загрузки занимался до распаковки и чтения тела
+service.add_middleware(UploadAdmissionMiddleware, paths=("/transcribe", "/transcribe/bulk"))
+
 service.include_router(health_router)
+service.include_router(metrics_router)
 service.include_router(tasks_router)
@@ -0,0 +1,241 @@
+"""Нагрузочный тест менеджера задач с локальными заглушками связанных сервисов.
+
+Запуск (требуется доступный экземпляр PostgreSQL с примененными миграциями):
+
+    python -m benchmarks.run --tasks 200 --concurrency 20 --watchers 3
+
+Результаты сохраняются в JSON, пригодном для сравнения прогонов.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+import uvicorn
+
+from .stubs import create_feedback_stub, create_preprocessing_stub, create_transcribing_stub
+
+STATUS_PATTERN = re.compile(r"""["']status["']:\s*["'](\w+)["']""")
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Task manager load benchmark.")
+    parser.add_argument("--tasks", type=int, default=100, help="Tasks to submit.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients.")
+    parser.add_argument("--watchers", type=int, default=1, help="SSE streams per task.")
+    parser.add_argument("--users", type=int, default=5, help="Distinct user ids.")
+    parser.add_argument("--reads", type=int, default=200, help="List and detail requests.")
+    parser.add_argument("--audio-size", type=int, default=256 * 1024, help="Upload size, bytes.")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Stub latency, sec.")
+    parser.add_argument(
+        "--preprocessed-size", type=int, default=512 * 1024, help="Preprocessed audio, bytes."
+    )
+    parser.add_argument("--words", type=int, default=20, help="Words per transcription.")
+    parser.add_argument("--mistakes", type=int, default=10, help="Mistakes per feedback.")
+    parser.add_argument("--port", type=int, default=18064, help="Task manager port.")
+    parser.add_argument("--stub-port", type=int, default=18065, help="First stub port.")
+    parser.add_argument(
+        "--target", default=None, help="URL of an already running task manager to drive."
+    )
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per task timeout, sec.")
+    parser.add_argument("--output", default=None, help="Path of the JSON result file.")
+    return parser.parse_args()
+
+
+def summarize(values: list[float]) -> dict[str, float | int | None]:
+    """Возвращает перцентили и среднее для набора измерений в секундах."""
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+
+    ordered = sorted(values)
+
+    def percentile(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "mean": statistics.fmean(ordered),
+        "max": ordered[-1],
+    }
+
+
+async def start_server(app, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+
+    while not server.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.01)
+
+    return server, serving
+
+
+async def watch_task(client: httpx.AsyncClient, task_id: str, user_id: str) -> tuple[str, float]:
+    """Открывает SSE стрим задачи и ждет терминального статуса."""
+    async with client.stream("POST", f"/{task_id}/stream", json={"user_id": user_id}) as stream:
+        async for line in stream.aiter_lines():
+            match = STATUS_PATTERN.search(line)
+            if match and match.group(1) in TERMINAL_STATUSES:
+                return match.group(1), time.perf_counter()
+
+    return "unknown", time.perf_counter()
+
+
+async def run_task(
+    client: httpx.AsyncClient,
+    limiter: asyncio.Semaphore,
+    args: argparse.Namespace,
+    user_id: str,
+) -> dict:
+    async with limiter:
+        started_at = time.perf_counter()
+        response = await client.post(
+            "/transcribe",
+            files={"file": ("audio.pcm", os.urandom(args.audio_size), "application/octet-stream")},
+            data={"title": "Benchmark", "user_id": user_id, "text_id": str(uuid4())},
+        )
+        response.raise_for_status()
+        submitted_at = time.perf_counter()
+
+    task_id = response.json()["id"]
+    watchers = [watch_task(client, task_id, user_id) for _ in range(args.watchers)]
+    outcomes = await asyncio.wait_for(asyncio.gather(*watchers), timeout=args.timeout)
+    status, finished_at = min(outcomes, key=lambda outcome: outcome[1])
+
+    return {
+        "task_id": task_id,
+        "user_id": user_id,
+        "status": status,
+        "submit": submitted_at - started_at,
+        "end_to_end": finished_at - started_at,
+    }
+
+
+async def run_reads(
+    client: httpx.AsyncClient, limiter: asyncio.Semaphore, tasks: list[dict], reads: int
+) -> dict[str, list[float]]:
+    latencies: dict[str, list[float]] = {"list": [], "detail": []}
+
+    async def read(kind: str, task: dict) -> None:
+        async with limiter:
+            started_at = time.perf_counter()
+            if kind == "list":
+                response = await client.post("/", json={"user_id": task["user_id"]})
+            else:
+                response = await client.post(
+                    f"/{task['task_id']}", json={"user_id": task["user_id"]}
+                )
+            response.raise_for_status()
+            latencies[kind].append(time.perf_counter() - started_at)
+
+    await asyncio.gather(
+        *(read(random.choice(("list", "detail")), random.choice(tasks)) for _ in range(reads))
+    )
+    return latencies
+
+
+def configure_stubs(args: argparse.Namespace) -> None:
+    for offset, name in enumerate(("PREPROCESSING", "TRANSCRIBING", "FEEDBACK")):
+        os.environ[f"MANAGER_SERVICE_{name}_HOST"] = "127.0.0.1"
+        os.environ[f"MANAGER_SERVICE_{name}_PORT"] = str(args.stub_port + offset)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    servers = []
+    stubs = (
+        create_preprocessing_stub(args.stub_latency, args.preprocessed_size),
+        create_transcribing_stub(args.stub_latency, args.words),
+        create_feedback_stub(args.stub_latency, args.mistakes),
+    )
+    for offset, stub in enumerate(stubs):
+        servers.append(await start_server(stub, args.stub_port + offset))
+
+    queries = {"count": 0}
+    base_url = args.target
+    if base_url is None:
+        # * Настройки читаются при импорте, поэтому приложение импортируется после configure_stubs
+        from sqlalchemy import event
+
+        from app import service
+        from database import engine
+
+        def count_query(*_) -> None:
+            queries["count"] += 1
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+        servers.append(await start_server(service, args.port))
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    users = [str(uuid4()) for _ in range(args.users)]
+    limiter = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+            started_at = time.perf_counter()
+            tasks = await asyncio.gather(
+                *(run_task(client, limiter, args, random.choice(users)) for _ in range(args.tasks))
+            )
+            elapsed = time.perf_counter() - started_at
+            pipeline_queries = queries["count"]
+
+            queries["count"] = 0
+            reads = await run_reads(client, limiter, tasks, args.reads)
+            read_queries = queries["count"]
+
+    finally:
+        for server, serving in reversed(servers):
+            server.should_exit = True
+            await serving
+
+    in_process = args.target is None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": {
+            "tasks_per_second": len(tasks) / elapsed,
+            "elapsed": elapsed,
+            "statuses": {
+                status: sum(1 for task in tasks if task["status"] == status)
+                for status in {task["status"] for task in tasks}
+            },
+            "submit_latency": summarize([task["submit"] for task in tasks]),
+            "end_to_end_latency": summarize([task["end_to_end"] for task in tasks]),
+            "list_latency": summarize(reads["list"]),
+            "detail_latency": summarize(reads["detail"]),
+            "db_queries_per_task": pipeline_queries / len(tasks) if in_process else None,
+            "db_queries_per_read": read_queries / args.reads if in_process and args.reads else None,
+            "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        },
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_stubs(arguments)
+    report = asyncio.run(main(arguments))
+
+    output = arguments.output or (
+        f"benchmarks/results/{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.json"
+    )
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    print(json.dumps(report["results"], indent=2, ensure_ascii=False))
+    print(f"Saved to {output}")
@@ -0,0 +1,90 @@
+"""Сравнение сериализации списка задач: модели Pydantic и быстрый путь.
+
+Запуск (БД не требуется):
+
+    python -m benchmarks.serialization --rows 5000 --repeat 20
+
+Прежний путь повторяет работу FastAPI: модель на каждую строку,
+повторная проверка возвращенной модели по `response_model`,
+`jsonable_encoder` и `json.dumps`. Быстрый путь сериализует словари
+строк через заранее созданный `TypeAdapter`.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from database.types import Status
+from routers.utils.serialization import dump_tasks_page
+from schemas.tasks import TasksPageResponse, TasksResponse
+
+TaskRow = namedtuple("TaskRow", ("id", "status", "title", "accuracy", "created_at"))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Task list serialization benchmark.")
+    parser.add_argument("--rows", type=int, default=1000, help="Tasks per page.")
+    parser.add_argument("--repeat", type=int, default=20, help="Measurements per path.")
+    return parser.parse_args()
+
+
+def generate_rows(count: int) -> list[TaskRow]:
+    now = datetime.now(timezone.utc)
+    statuses = (Status.COMPLETED, Status.FAILED, Status.CREATED)
+    return [
+        TaskRow(
+            id=uuid4(),
+            status=random.choice(statuses),
+            title="Упражнение",
+            accuracy=round(random.uniform(0, 100), 2),
+            created_at=now - timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def model_path(rows: list[TaskRow]) -> bytes:
+    items = [TasksResponse.model_validate(row) for row in rows]
+    page = TasksPageResponse(items=items, next_cursor=None)
+    validated = TasksPageResponse.model_validate(page.model_dump())
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def fast_path(rows: list[TaskRow]) -> bytes:
+    return dump_tasks_page([row._asdict() for row in rows], None)
+
+
+def measure(path, rows: list[TaskRow], repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        path(rows)
+        timings.append(time.perf_counter() - started_at)
+
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rows = generate_rows(args.rows)
+
+    if json.loads(model_path(rows)) != json.loads(fast_path(rows)):
+        raise SystemExit("Serialization paths produce different documents.")
+
+    model = measure(model_path, rows, args.repeat)
+    fast = measure(fast_path, rows, args.repeat)
+    report = {
+        "rows": args.rows,
+        "model_path": model,
+        "fast_path": fast,
+        "speedup": model["median"] / fast["median"],
+    }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import random
+from typing import Annotated
+
+from fastapi import Body, FastAPI, File, Form, UploadFile
+from fastapi.responses import Response
+
+PHONEMES = ("hæd", "suːt", "jɚ", "ʃi", "dɑːɹk")
+
+
+def create_preprocessing_stub(latency: float, payload_size: int) -> FastAPI:
+    """Создает заглушку сервиса предобработки.
+    Отвечает случайными байтами размера `payload_size` через `latency` секунд.
+    """
+    stub = FastAPI()
+
+    @stub.get("/health")
+    async def health() -> dict:
+        return {"status": "healthy"}
+
+    @stub.post("/")
+    async def preprocess(file: Annotated[UploadFile, File(...)]) -> Response:
+        await file.read()
+        await asyncio.sleep(latency)
+        return Response(content=os.urandom(payload_size), media_type="audio/wav")
+
+    return stub
+
+
+def create_transcribing_stub(latency: float, words: int) -> FastAPI:
+    """Создает заглушку сервиса транскрибирования, в том числе пакетного.
+    Отвечает транскрипцией из `words` слов через `latency` секунд на запрос.
+    """
+    stub = FastAPI()
+
+    def transcription() -> str:
+        return " ".join(random.choices(PHONEMES, k=words))
+
+    @stub.get("/health")
+    async def health() -> dict:
+        return {"status": "healthy"}
+
+    @stub.post("/")
+    async def transcribe(
+        file: Annotated[UploadFile, File(...)], lang: Annotated[str, Form(...)]
+    ) -> dict:
+        await file.read()
+        await asyncio.sleep(latency)
+        return {"transcription": transcription()}
+
+    @stub.post("/batch")
+    async def transcribe_batch(
+        files: Annotated[list[UploadFile], File(...)], lang: Annotated[str, Form(...)]
+    ) -> dict:
+        for file in files:
+            await file.read()
+        await asyncio.sleep(latency)
+        return {"transcriptions": [transcription() for _ in files]}
+
+    return stub
+
+
+def create_feedback_stub(latency: float, mistakes: int) -> FastAPI:
+    """Создает заглушку сервиса оценки.
+    Отвечает отчетом с `mistakes` ошибками через `latency` секунд.
+    """
+    stub = FastAPI()
+
+    @stub.get("/health")
+    async def health() -> dict:
+        return {"status": "healthy"}
+
+    @stub.post("/")
+    async def evaluate(data: Annotated[dict, Body(...)]) -> dict:
+        await asyncio.sleep(latency)
+        return {
+            "accuracy": round(random.uniform(0.0, 100.0), 2),
+            "mistakes": [
+                {
+                    "reference": {"position": position, "value": "ɑː"},
+                    "actual": {"position": position, "value": "oʊ"},
+                    "type": "replacement",
+                }
+                for position in range(mistakes)
+            ],
+        }
+
+    return stub
@@ -1,8 +1,20 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .admission import AdmissionConfiguration
+from .batching import BatchingConfiguration
+from .cache import CacheConfiguration
 from .database import DatabaseConfiguration
+from .events import EventsConfiguration
+from .server import ServerConfiguration
 from .services import ServicesConfiguration
 from .graylog import GraylogConfiguration
+from .idempotency import IdempotencyConfiguration
+from .logging import LoggingConfiguration
+from .partitions import PartitionsConfiguration
+from .readiness import ReadinessConfiguration
+from .scheduler import SchedulerConfiguration
+from .storage import StorageConfiguration
+from .worker import WorkerConfiguration
 
 
 class ProjectConfiguration(BaseSettings):
@@ -11,7 +23,19 @@ class ProjectConfiguration(BaseSettings):
     # * Вложенные группы настроек
     database: DatabaseConfiguration = DatabaseConfiguration()
     services: ServicesConfiguration = ServicesConfiguration()
+    server: ServerConfiguration = ServerConfiguration()
     graylog: GraylogConfiguration = GraylogConfiguration()
+    idempotency: IdempotencyConfiguration = IdempotencyConfiguration()
+    logging: LoggingConfiguration = LoggingConfiguration()
+    partitions: PartitionsConfiguration = PartitionsConfiguration()
+    readiness: ReadinessConfiguration = ReadinessConfiguration()
+    scheduler: SchedulerConfiguration = SchedulerConfiguration()
+    admission: AdmissionConfiguration = AdmissionConfiguration()
+    batching: BatchingConfiguration = BatchingConfiguration()
+    cache: CacheConfiguration = CacheConfiguration()
+    events: EventsConfiguration = EventsConfiguration()
+    storage: StorageConfiguration = StorageConfiguration()
+    worker: WorkerConfiguration = WorkerConfiguration()
 
     # * Опциональные переменные
     DEBUG_MODE: bool = True
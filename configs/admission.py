@@ -0,0 +1,14 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AdmissionConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_ADMISSION_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    MAX_ACTIVE_TASKS: int = 1000
+    MAX_USER_ACTIVE_TASKS: int = 100
+    MAX_CONCURRENT_UPLOADS: int = 32
+    QUEUE_SIZE: int = 64
+    QUEUE_TIMEOUT: float = 10.0
+    RETRY_AFTER: int = 5
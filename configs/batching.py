@@ -0,0 +1,11 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class BatchingConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_BATCHING_")
+
+    # * Опциональные переменные
+    ENABLE: bool = False
+    WINDOW: float = 0.05
+    MAX_SIZE: int = 8
+    PATH: str = "/batch"
@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_CACHE_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    MAX_SIZE: int = 1024
+    TTL: float = 3600.0
+    STORAGE_TTL: float = 30 * 24 * 3600.0
+    DETAIL_MAX_SIZE: int = 4096
+    DETAIL_TTL: float = 600.0
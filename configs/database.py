@@ -22,3 +22,13 @@ class DatabaseConfiguration(BaseSettings):
             port=self.POSTGRES_PORT,
             db_name=self.POSTGRES_NAME,
         )
+
+    @property
+    def DSN(self) -> str:
+        return "postgresql://{user}:{password}@{host}:{port}/{db_name}".format(
+            user=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_HOST,
+            port=self.POSTGRES_PORT,
+            db_name=self.POSTGRES_NAME,
+        )
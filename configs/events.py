@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class EventsConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_EVENTS_")
+
+    # * Опциональные переменные
+    CHANNEL: str = "task_events"
+    FALLBACK_INTERVAL: float = 10.0
+    RECONNECT_INTERVAL: float = 5.0
+    QUEUE_SIZE: int = 64
+    STATUS_MAX_SIZE: int = 10000
+    STATUS_TTL: float = 3600.0
@@ -8,3 +8,6 @@ class GraylogConfiguration(BaseSettings):
     HOST: str = "localhost"
     PORT: int = 12201
     ENABLE: bool = False
+    PROTOCOL: str = "udp"
+    BATCH_SIZE: int = 100
+    FLUSH_INTERVAL: float = 1.0
@@ -0,0 +1,8 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class IdempotencyConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_IDEMPOTENCY_")
+
+    # * Опциональные переменные
+    TTL: float = 24 * 3600.0
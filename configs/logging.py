@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class LoggingConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_LOGGING_")
+
+    # * Опциональные переменные
+    LEVEL: str | None = None
+    ENQUEUE: bool = True
+    SAMPLE_RATE: float = 1.0
@@ -0,0 +1,11 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class PartitionsConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_PARTITIONS_")
+
+    # * Опциональные переменные
+    MONTHS_AHEAD: int = 3
+    # ! Архивация отключает задачи от таблицы, API их больше не выдает
+    RETENTION_MONTHS: int = 0
+    ARCHIVE_PATH: str = ""
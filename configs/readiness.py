@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ReadinessConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_READINESS_")
+
+    # * Опциональные переменные
+    INTERVAL: float = 5.0
+    TIMEOUT: float = 2.0
+    WARMUP: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_HTTP_CONNECTIONS: int = 2
@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class SchedulerConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_SCHEDULER_")
+
+    # * Опциональные переменные
+    INTERACTIVE_WEIGHT: float = 4.0
+    BULK_WEIGHT: float = 1.0
+    MAX_WAIT: float = 600.0
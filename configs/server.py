@@ -0,0 +1,11 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ServerConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_SERVER_")
+
+    # * Опциональные переменные
+    HOST: str = "0.0.0.0"
+    PORT: int = 8064
+    ROLE: str = "all"
+    WORKERS: int = 1
@@ -8,6 +8,20 @@ class ServiceConfiguration(BaseSettings):
 
     # * Опциональные переменные
     PROTOCOL: str = "http"
+    MAX_CONNECTIONS: int = 100
+    MAX_KEEPALIVE_CONNECTIONS: int = 20
+    KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2: bool = False
+    CONNECT_TIMEOUT: float = 5.0
+    TIMEOUT: float = 60.0
+    RETRIES: int = 2
+    RETRY_BACKOFF: float = 0.2
+    RETRY_MAX_BACKOFF: float = 2.0
+    BREAKER_THRESHOLD: int = 5
+    BREAKER_RECOVERY: float = 30.0
+    BREAKER_MAX_WAIT: float = 0.0
+    ACCEPT_ENCODINGS: list[str] = []
+    HEALTH_PATH: str = "/health"
 
     @property
     def URL(self) -> str:
@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class StorageConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_STORAGE_")
+
+    # * Опциональные переменные
+    PATH: str = "./data"
+    CHUNK_SIZE: int = 1024 * 1024
+    SPOOL_MAX_SIZE: int = 8 * 1024 * 1024
+    MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024
+    MAX_DECOMPRESSED_SIZE: int = 200 * 1024 * 1024
@@ -0,0 +1,15 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class WorkerConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MANAGER_WORKER_")
+
+    # * Опциональные переменные
+    CONCURRENCY: int = 4
+    POLL_INTERVAL: float = 1.0
+    EMBEDDED: bool = True
+    METRICS_PORT: int = 0
+    STREAMING_PIPELINE: bool = False
+    CHECKPOINTS: bool = True
+    LEASE_TTL: float = 60.0
+    MAX_ATTEMPTS: int = 3
@@ -1,3 +1,3 @@
-from .engine import BaseORM, disconnect_db, engine, get_db
+from .engine import BaseORM, LocalAsyncSession, disconnect_db, engine, get_db
 
-__all__ = ("BaseORM", "disconnect_db", "engine", "get_db")
+__all__ = ("BaseORM", "LocalAsyncSession", "disconnect_db", "engine", "get_db")
@@ -1,15 +1,30 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import JSON, CheckConstraint, Column, DateTime, Enum, Float, Index, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from .engine import BaseORM
-from .types import Status
+from .types import Checkpoint, Priority, Status
 
 
 class Task(BaseORM):
-    """ORM модель, описывающая общую задачу оценки произношения пользователя."""
+    """ORM модель, описывающая общую задачу оценки произношения пользователя.
+
+    Таблица секционирована по месяцам по времени создания задачи, поэтому
+    время создания входит в первичный ключ.
+    """
 
     __tablename__ = "tasks"
 
@@ -18,11 +33,18 @@ class Task(BaseORM):
     user_id = Column(UUID(as_uuid=True), nullable=False)
     text_id = Column(UUID(as_uuid=True), nullable=False)
     status = Column(Enum(Status), nullable=False, default=Status.CREATED)
+    priority = Column(
+        Enum(Priority),
+        nullable=False,
+        default=Priority.INTERACTIVE,
+        server_default=Priority.INTERACTIVE.name,
+    )
     result = Column(Text, nullable=True, default=None)
     accuracy = Column(Float(3), nullable=True, default=None)
-    mistakes = Column(JSON, nullable=True, default=None)
+    mistakes = Column(JSONB, nullable=True, default=None)
     created_at = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         default=lambda _: datetime.now(timezone.utc),
     )
@@ -32,9 +54,65 @@ class Task(BaseORM):
         default=None,
     )
     comment = Column(Text, nullable=True, default=None)
+    audio_hash = Column(String(64), nullable=True, default=None)
+    checkpoint = Column(Enum(Checkpoint), nullable=True, default=None)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, default=None)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
 
     __table_args__ = (
         Index("task_text_id_idx", text_id, postgresql_using="hash"),
         Index("task_user_id_idx", user_id, postgresql_using="hash"),
+        Index("task_user_id_created_at_idx", user_id, created_at.desc()),
+        Index(
+            "task_active_idx",
+            user_id,
+            postgresql_where=text("status NOT IN ('COMPLETED', 'FAILED')"),
+        ),
+        Index("task_queue_idx", created_at, postgresql_where=text("status = 'CREATED'")),
+        Index(
+            "task_lease_idx",
+            lease_expires_at,
+            postgresql_where=text("status NOT IN ('CREATED', 'COMPLETED', 'FAILED')"),
+        ),
         CheckConstraint((accuracy >= 0.0) & (accuracy <= 100.0), name="check_accuracy"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class CachedResult(BaseORM):
+    """ORM модель, описывающая сохраненный результат оценки аудиофайла.
+    Ключом служит хеш содержимого аудиофайла и идентификатор текста.
+    """
+
+    __tablename__ = "results_cache"
+
+    audio_hash = Column(String(64), primary_key=True)
+    text_id = Column(UUID(as_uuid=True), primary_key=True)
+    result = Column(Text, nullable=True, default=None)
+    accuracy = Column(Float(3), nullable=True, default=None)
+    mistakes = Column(JSONB, nullable=True, default=None)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda _: datetime.now(timezone.utc),
+    )
+
+
+class IdempotencyKey(BaseORM):
+    """ORM модель, описывающая ключ идемпотентности создания задачи.
+    Ключ уникален в пределах пользователя и действует до `expires_at`.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    task_id = Column(UUID(as_uuid=True), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda _: datetime.now(timezone.utc),
     )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("idempotency_keys_expires_at_idx", expires_at),)
@@ -0,0 +1,277 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Iterable
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import configs
+from service_logging import logger
+
+from .models import Task
+from .types import Status
+
+TERMINAL_STATUSES = (Status.COMPLETED, Status.FAILED)
+
+
+def _build_payload(task_id: UUID, user_id: UUID, status: str) -> str:
+    return json.dumps({"id": str(task_id), "user_id": str(user_id), "status": status})
+
+
+async def notify_status(db: AsyncSession, task_obj: Task) -> None:
+    """Отправляет в канал событий уведомление о текущем статусе задачи.
+
+    Уведомление выполняется в текущей транзакции сессии и доставляется
+    подписчикам только после её фиксации.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        task_obj (Task): Обьект ORM задачи.
+    """
+    await notify_statuses(db, [(task_obj.id, task_obj.user_id, task_obj.status)])
+
+
+async def notify_statuses(db: AsyncSession, statuses: Iterable[tuple[UUID, UUID, Status]]) -> None:
+    """Отправляет в канал событий уведомления о статусах нескольких задач одним запросом.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        statuses (Iterable[tuple[UUID, UUID, Status]]): Идентификатор задачи,
+            идентификатор пользователя и статус для каждой задачи.
+    """
+    notifications = [
+        func.pg_notify(configs.events.CHANNEL, _build_payload(task_id, user_id, status.value))
+        for task_id, user_id, status in statuses
+    ]
+    if notifications:
+        await db.execute(select(*notifications))
+
+
+class TaskEventsListener:
+    """Слушатель канала событий задач.
+
+    Держит одно выделенное соединение с PostgreSQL на процесс, выполняет
+    `LISTEN` и раздает полученные события подписчикам через очереди в памяти.
+    При потере соединения переподключается в фоне.
+
+    Промежуточные статусы задач в БД не записываются: они рассылаются через
+    канал и хранятся в памяти каждого процесса, получившего событие. Запись
+    удаляется при получении терминального статуса или по истечении `status_ttl`.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        queue_size: int,
+        reconnect_interval: float,
+        status_max_size: int,
+        status_ttl: float,
+    ) -> None:
+        self.channel = channel
+        self.queue_size = queue_size
+        self.reconnect_interval = reconnect_interval
+        self.status_max_size = status_max_size
+        self.status_ttl = status_ttl
+        self._subscribers: defaultdict[UUID, set[asyncio.Queue]] = defaultdict(set)
+        self._user_subscribers: defaultdict[UUID, set[asyncio.Queue]] = defaultdict(set)
+        self._statuses: OrderedDict[UUID, tuple[Status, float]] = OrderedDict()
+        self._connection: asyncpg.Connection | None = None
+        self._send_lock = asyncio.Lock()
+        self._supervisor: asyncio.Task | None = None
+
+    def subscribe(self, task_id: UUID) -> asyncio.Queue:
+        """Подписывается на события задачи.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+
+        Returns:
+            asyncio.Queue: Очередь, в которую будут поступать события задачи.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[task_id].add(queue)
+        return queue
+
+    def subscribe_user(self, user_id: UUID) -> asyncio.Queue:
+        """Подписывается на события всех задач пользователя.
+
+        Args:
+            user_id (UUID): Идентификатор пользователя.
+
+        Returns:
+            asyncio.Queue: Очередь, в которую будут поступать события задач.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._user_subscribers[user_id].add(queue)
+        return queue
+
+    @staticmethod
+    def _discard(
+        subscribers: defaultdict[UUID, set[asyncio.Queue]], key: UUID, queue: asyncio.Queue
+    ) -> None:
+        queues = subscribers.get(key)
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del subscribers[key]
+
+    def unsubscribe(self, task_id: UUID, queue: asyncio.Queue) -> None:
+        """Отменяет подписку на события задачи.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            queue (asyncio.Queue): Очередь, полученная при подписке.
+        """
+        self._discard(self._subscribers, task_id, queue)
+
+    def unsubscribe_user(self, user_id: UUID, queue: asyncio.Queue) -> None:
+        """Отменяет подписку на события задач пользователя.
+
+        Args:
+            user_id (UUID): Идентификатор пользователя.
+            queue (asyncio.Queue): Очередь, полученная при подписке.
+        """
+        self._discard(self._user_subscribers, user_id, queue)
+
+    def status(self, task_id: UUID) -> Status | None:
+        """Возвращает последний промежуточный статус задачи, известный процессу.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+
+        Returns:
+            Status | None: Статус задачи или None, если он неизвестен или устарел.
+        """
+        entry = self._statuses.get(task_id)
+        if entry is None:
+            return None
+
+        status, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._statuses[task_id]
+            return None
+
+        return status
+
+    def _remember(self, task_id: UUID, status: Status) -> None:
+        if status in TERMINAL_STATUSES:
+            self._statuses.pop(task_id, None)
+            return
+
+        self._statuses[task_id] = (status, time.monotonic() + self.status_ttl)
+        self._statuses.move_to_end(task_id)
+        while len(self._statuses) > self.status_max_size:
+            self._statuses.popitem(last=False)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Запоминает статус из события и раздает событие всем подписчикам задачи
+        и её пользователя. При переполнении очереди подписчика событие отбрасывается.
+
+        Args:
+            event (dict[str, Any]): Событие задачи.
+        """
+        task_id = UUID(event["id"])
+        self._remember(task_id, Status(event["status"]))
+
+        queues = (
+            *self._subscribers.get(task_id, ()),
+            *self._user_subscribers.get(UUID(event["user_id"]), ()),
+        )
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Subscriber queue is full, event dropped: {event['id']}")
+
+    async def notify(self, task_obj: Task) -> None:
+        """Рассылает промежуточный статус задачи без записи в БД.
+
+        Уведомление отправляется через соединение слушателя, поэтому не
+        занимает соединение из пула. Если соединения нет, событие
+        раздается только подписчикам текущего процесса.
+
+        Args:
+            task_obj (Task): Обьект ORM задачи.
+        """
+        payload = _build_payload(task_obj.id, task_obj.user_id, task_obj.status.value)
+        connection = self._connection
+
+        if connection is not None and not connection.is_closed():
+            try:
+                async with self._send_lock:
+                    await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+                return
+
+            except Exception as error:
+                logger.warning(f"Failed to send task event: {error}")
+
+        self.publish(json.loads(payload))
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            self.publish(json.loads(payload))
+        except (ValueError, KeyError) as error:
+            logger.error(f"Malformed task event: {error}")
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(configs.database.DSN)
+        terminated = asyncio.Event()
+        connection.add_termination_listener(lambda _: terminated.set())
+
+        try:
+            await connection.add_listener(self.channel, self._on_notification)
+            self._connection = connection
+            logger.info(f"Listening to task events on '{self.channel}'.")
+            await terminated.wait()
+
+        finally:
+            self._connection = None
+            if not connection.is_closed():
+                await connection.close()
+
+    async def _supervise(self) -> None:
+        while True:
+            try:
+                await self._listen()
+                logger.warning("Task events connection lost.")
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as error:
+                logger.error(f"Task events listener failed: {error}")
+
+            await asyncio.sleep(self.reconnect_interval)
+
+    def start(self) -> None:
+        """Запускает прослушивание канала событий в фоне."""
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        """Останавливает прослушивание канала событий и закрывает соединение."""
+        if self._supervisor is None:
+            return
+
+        self._supervisor.cancel()
+        try:
+            await self._supervisor
+        except asyncio.CancelledError:
+            pass
+
+        self._supervisor = None
+
+
+task_events = TaskEventsListener(
+    configs.events.CHANNEL,
+    configs.events.QUEUE_SIZE,
+    configs.events.RECONNECT_INTERVAL,
+    configs.events.STATUS_MAX_SIZE,
+    configs.events.STATUS_TTL,
+)
@@ -12,3 +12,17 @@ class Status(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     UNKNOWN = "unknown"
+
+
+class Priority(Enum):
+    """Перечисление полос приоритета обработки задач."""
+
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+class Checkpoint(Enum):
+    """Перечисление сохраненных этапов пайплайна задачи."""
+
+    PREPROCESSED = "preprocessed"
+    TRANSCRIBED = "transcribed"
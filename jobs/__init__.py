@@ -0,0 +1,17 @@
+from .idempotency import purge_idempotency_keys
+from .partitions import archive_partitions, create_partitions
+from .queue import claim_tasks, recover_tasks, renew_leases
+from .scheduler import LaneScheduler, scheduler
+from .worker import Worker
+
+__all__ = (
+    "LaneScheduler",
+    "Worker",
+    "archive_partitions",
+    "claim_tasks",
+    "create_partitions",
+    "purge_idempotency_keys",
+    "recover_tasks",
+    "renew_leases",
+    "scheduler",
+)
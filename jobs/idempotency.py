@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import IdempotencyKey
+
+
+async def purge_idempotency_keys(db: AsyncSession) -> int:
+    """Удаляет ключи идемпотентности с истекшим сроком действия.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+
+    Returns:
+        int: Количество удаленных ключей.
+    """
+    stmt = delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+    purged = await db.execute(stmt)
+    await db.commit()
+
+    return purged.rowcount
@@ -0,0 +1,201 @@
+import gzip
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service_logging import logger
+
+PARTITION_PATTERN = re.compile(r"^tasks_p(\d{4})(\d{2})$")
+DEFAULT_PARTITION = "tasks_default"
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _current_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    """Возвращает имя раздела таблицы задач за указанный месяц.
+
+    Args:
+        month (date): Первый день месяца.
+
+    Returns:
+        str: Имя раздела.
+    """
+    return f"tasks_p{month:%Y%m}"
+
+
+async def list_partitions(db: AsyncSession) -> dict[str, date | None]:
+    """Возвращает разделы, подключенные к таблице задач.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+
+    Returns:
+        dict[str, date | None]: Первый день месяца по имени месячного раздела
+            и None для раздела по умолчанию.
+    """
+    stmt = text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "WHERE parent.relname = 'tasks'"
+    )
+    names = await db.execute(stmt)
+
+    partitions = {}
+    for name in names.scalars():
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions[name] = date(int(match.group(1)), int(match.group(2)), 1)
+        elif name == DEFAULT_PARTITION:
+            partitions[name] = None
+
+    return partitions
+
+
+async def _default_partition_months(db: AsyncSession) -> set[date]:
+    stmt = text(
+        f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date "
+        f"FROM {DEFAULT_PARTITION}"
+    )
+    months = await db.execute(stmt)
+    return set(months.scalars())
+
+
+async def _create_partition(db: AsyncSession, month: date, move_from_default: bool) -> None:
+    name = partition_name(month)
+    lower, upper = f"{month} 00:00:00+00", f"{_add_months(month, 1)} 00:00:00+00"
+
+    # * Имя и границы формируются из дат, поэтому подстановка в DDL безопасна
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF tasks FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    if not move_from_default:
+        await db.execute(create)
+        return
+
+    # * Строки месяца в разделе по умолчанию нарушили бы ограничение нового раздела,
+    # * поэтому раздел по умолчанию отключается на время их переноса
+    await db.execute(text(f"ALTER TABLE tasks DETACH PARTITION {DEFAULT_PARTITION}"))
+    await db.execute(create)
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE created_at >= '{lower}' AND created_at < '{upper}' RETURNING *) "
+            f"INSERT INTO tasks SELECT * FROM moved"
+        )
+    )
+    await db.execute(text(f"ALTER TABLE tasks ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+async def create_partitions(db: AsyncSession, months_ahead: int) -> list[str]:
+    """Создает разделы таблицы задач с текущего месяца на `months_ahead` месяцев вперед,
+    а также разделы для месяцев, задачи которых попали в раздел по умолчанию.
+
+    Раздел по умолчанию отключается на время создания раздела только если
+    в нем есть задачи этого месяца: они переносятся в созданный раздел, поэтому
+    на них распространяется и архивация по сроку хранения. Каждый раздел
+    создается в отдельной транзакции.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        months_ahead (int): На сколько месяцев вперед создавать разделы.
+
+    Returns:
+        list[str]: Имена созданных разделов.
+    """
+    existing = await list_partitions(db)
+    default_months = set()
+    if DEFAULT_PARTITION in existing:
+        default_months = await _default_partition_months(db)
+
+    current = _current_month()
+    months = {_add_months(current, offset) for offset in range(months_ahead + 1)}
+    months |= default_months
+
+    created = []
+    for month in sorted(months):
+        name = partition_name(month)
+        if name in existing:
+            continue
+
+        await _create_partition(db, month, month in default_months)
+        await db.commit()
+        created.append(name)
+
+    return created
+
+
+async def _export_partition(db: AsyncSession, name: str, archive_dir: Path) -> Path:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archive_file = archive_dir / f"{name}.jsonl.gz"
+
+    rows = await db.stream(text(f"SELECT row_to_json({name})::text FROM {name}"))
+    with gzip.open(archive_file, "wt", encoding="utf-8") as archive:
+        async for (row,) in rows:
+            archive.write(row)
+            archive.write("\n")
+
+    return archive_file
+
+
+async def archive_partitions(
+    db: AsyncSession, retention_months: int, archive_path: str
+) -> list[str]:
+    """Отключает от таблицы задач разделы старше `retention_months` месяцев.
+    Задачи отключенных разделов больше не выдаются API.
+
+    Если задан `archive_path`, содержимое раздела выгружается туда в виде
+    сжатого JSON Lines файла, после чего раздел удаляется. Иначе раздел
+    остается в БД отдельной таблицей.
+
+    Старые задачи из раздела по умолчанию предварительно переносятся
+    в месячные разделы и архивируются вместе с ними.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        retention_months (int): Сколько месяцев хранить задачи в таблице.
+        archive_path (str): Директория архива или пустая строка.
+
+    Returns:
+        list[str]: Имена отключенных разделов.
+    """
+    cutoff = _add_months(_current_month(), -retention_months)
+
+    partitions = await list_partitions(db)
+    if DEFAULT_PARTITION in partitions:
+        for month in sorted(await _default_partition_months(db)):
+            if month < cutoff and partition_name(month) not in partitions:
+                await _create_partition(db, month, move_from_default=True)
+                await db.commit()
+
+        partitions = await list_partitions(db)
+
+    archived = []
+    for name, month in sorted(partitions.items()):
+        if month is None or month >= cutoff:
+            continue
+
+        await db.execute(text(f"ALTER TABLE tasks DETACH PARTITION {name}"))
+        await db.commit()
+
+        if archive_path:
+            archive_file = await _export_partition(db, name, Path(archive_path))
+            await db.execute(text(f"DROP TABLE {name}"))
+            await db.commit()
+            logger.info(f"Partition {name} archived to {archive_file}.")
+        else:
+            logger.info(f"Partition {name} detached.")
+
+        archived.append(name)
+
+    return archived
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import Float, Text, case, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import configs
+from database.models import Task
+from database.types import Priority, Status
+from service_metrics import queue_wait_duration
+
+TERMINAL_STATUSES = (Status.COMPLETED, Status.FAILED)
+
+
+def _lease_expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=configs.worker.LEASE_TTL)
+
+
+def _queued_tasks(
+    limit: int,
+    weights: dict[Priority, float],
+    offsets: dict[Priority, float],
+    aged_before: datetime,
+):
+    # * Сколько задач каждого пользователя уже выполняется
+    running = (
+        select(Task.user_id, func.count().label("running"))
+        .where(Task.status.not_in((Status.CREATED, *TERMINAL_STATUSES)))
+        .group_by(Task.user_id)
+        .subquery("running")
+    )
+
+    # * Очередь пользователя внутри полосы продолжается после его выполняемых задач
+    user_rank = func.row_number().over(
+        partition_by=(Task.priority, Task.user_id), order_by=Task.created_at
+    ) + func.coalesce(running.c.running, 0)
+    ranked = (
+        select(Task.id, Task.created_at, Task.priority, user_rank.label("user_rank"))
+        .outerjoin(running, running.c.user_id == Task.user_id)
+        .where(Task.status == Status.CREATED)
+        .subquery("ranked")
+    )
+
+    # * Виртуальное время полосы растет обратно пропорционально ее весу
+    lane_rank = func.row_number().over(
+        partition_by=ranked.c.priority, order_by=(ranked.c.user_rank, ranked.c.created_at)
+    )
+    virtual_time = case(
+        (ranked.c.created_at < aged_before, 0.0),
+        *(
+            (ranked.c.priority == priority, offsets[priority] + lane_rank.cast(Float) / weight)
+            for priority, weight in weights.items()
+        ),
+    )
+    candidates = select(
+        ranked.c.id, ranked.c.created_at, virtual_time.label("virtual_time")
+    ).subquery("candidates")
+
+    return (
+        select(Task.id)
+        .join(
+            candidates,
+            (candidates.c.id == Task.id) & (candidates.c.created_at == Task.created_at),
+        )
+        .where(Task.status == Status.CREATED)
+        .order_by(candidates.c.virtual_time, candidates.c.created_at)
+        .limit(limit)
+        .with_for_update(of=Task, skip_locked=True)
+    )
+
+
+async def claim_tasks(
+    db: AsyncSession,
+    limit: int,
+    weights: dict[Priority, float],
+    offsets: dict[Priority, float],
+    aged_before: datetime,
+) -> list[tuple[UUID, Priority]]:
+    """Забирает из очереди до `limit` созданных задач, переводя их в статус STARTED
+    и выдавая на них аренду длительностью `MANAGER_WORKER_LEASE_TTL` секунд.
+
+    Задачи упорядочиваются по виртуальному времени: внутри полосы приоритета
+    пользователи обслуживаются по очереди с учетом уже выполняемых ими задач,
+    а полосы делят слоты пропорционально весам со сдвигом `offsets`. Задачи,
+    созданные раньше `aged_before`, забираются первыми независимо от полосы.
+
+    Выборка выполняется через `SELECT ... FOR UPDATE SKIP LOCKED`, поэтому
+    несколько обработчиков могут конкурентно разбирать очередь, не получая
+    одну и ту же задачу дважды. О смене статуса каждой захваченной задачи
+    отправляется уведомление в канал событий.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        limit (int): Максимальное количество задач.
+        weights (dict[Priority, float]): Веса полос приоритета.
+        offsets (dict[Priority, float]): Виртуальное время, с которого начинается полоса.
+        aged_before (datetime): Граница времени создания для задач без учета полосы.
+
+    Returns:
+        list[tuple[UUID, Priority]]: Идентификаторы и полосы захваченных задач.
+    """
+    queued = _queued_tasks(limit, weights, offsets, aged_before)
+    claimed = (
+        update(Task)
+        .where(Task.id.in_(queued))
+        .values(
+            status=Status.STARTED,
+            lease_expires_at=_lease_expires_at(),
+            attempts=Task.attempts + 1,
+        )
+        .returning(Task.id, Task.user_id, Task.priority, Task.created_at)
+        .cte("claimed")
+    )
+    payload = func.json_build_object(
+        "id", claimed.c.id, "user_id", claimed.c.user_id, "status", Status.STARTED.value
+    )
+    stmt = select(
+        claimed.c.id,
+        claimed.c.priority,
+        claimed.c.created_at,
+        func.pg_notify(configs.events.CHANNEL, payload.cast(Text)),
+    )
+    result = await db.execute(stmt)
+    rows = result.all()
+    await db.commit()
+
+    claimed_at = datetime.now(timezone.utc)
+    for row in rows:
+        queue_wait_duration.observe(
+            (claimed_at - row.created_at).total_seconds(), priority=row.priority.value
+        )
+
+    return [(row.id, row.priority) for row in rows]
+
+
+async def recover_tasks(db: AsyncSession, limit: int) -> list[UUID]:
+    """Забирает до `limit` незавершенных задач, аренда которых истекла,
+    то есть обработчик которых завершился аварийно, выдавая на них новую аренду.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        limit (int): Максимальное количество задач.
+
+    Returns:
+        list[UUID]: Идентификаторы восстановленных задач.
+    """
+    orphaned = (
+        select(Task.id)
+        .where(
+            Task.status.not_in((Status.CREATED, *TERMINAL_STATUSES))
+            & (
+                Task.lease_expires_at.is_(None)
+                | (Task.lease_expires_at < datetime.now(timezone.utc))
+            )
+        )
+        .order_by(Task.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Task)
+        .where(Task.id.in_(orphaned))
+        .values(lease_expires_at=_lease_expires_at(), attempts=Task.attempts + 1)
+        .returning(Task.id)
+    )
+    result = await db.execute(stmt)
+    task_ids = list(result.scalars().all())
+    await db.commit()
+
+    return task_ids
+
+
+async def renew_leases(db: AsyncSession, leases: dict[UUID, int]) -> None:
+    """Продлевает аренду выполняемых задач одним запросом.
+
+    Аренда продлевается только для попытки, под которой задача была захвачена,
+    поэтому обработчик не продлевает аренду задачи, переданной другому.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        leases (dict[UUID, int]): Номера попыток по идентификаторам выполняемых задач.
+    """
+    stmt = (
+        update(Task)
+        .where(tuple_(Task.id, Task.attempts).in_(list(leases.items())))
+        .values(lease_expires_at=_lease_expires_at())
+    )
+    await db.execute(stmt)
+    await db.commit()
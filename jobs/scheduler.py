@@ -0,0 +1,65 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import configs
+from database.types import Priority
+
+from .queue import claim_tasks
+
+
+class LaneScheduler:
+    """Планировщик захвата задач из очереди по полосам приоритета.
+
+    Полосы делят слоты обработчиков пропорционально весам: каждая
+    захваченная задача сдвигает виртуальное время своей полосы на
+    `1 / weight`, и следующей выбирается задача с наименьшим временем.
+    Отставание простаивавшей полосы ограничено одной единицей времени,
+    чтобы после простоя она не вытесняла остальные надолго. Задачи,
+    ожидающие дольше `max_wait` секунд, захватываются вне очереди,
+    поэтому ни одна полоса не голодает.
+    """
+
+    def __init__(self, weights: dict[Priority, float], max_wait: float) -> None:
+        self.weights = weights
+        self.max_wait = max_wait
+        self._offsets = {priority: 0.0 for priority in weights}
+
+    def _advance(self, claimed: Counter) -> None:
+        for priority, count in claimed.items():
+            self._offsets[priority] += count / self.weights[priority]
+
+        leader = max(self._offsets.values())
+        for priority, offset in self._offsets.items():
+            self._offsets[priority] = max(offset, leader - 1.0)
+
+        base = min(self._offsets.values())
+        for priority in self._offsets:
+            self._offsets[priority] -= base
+
+    async def claim(self, db: AsyncSession, limit: int) -> list[UUID]:
+        """Забирает из очереди до `limit` задач с учетом полос приоритета.
+
+        Args:
+            db (AsyncSession): Обьект сессии базы данных.
+            limit (int): Максимальное количество задач.
+
+        Returns:
+            list[UUID]: Идентификаторы захваченных задач.
+        """
+        aged_before = datetime.now(timezone.utc) - timedelta(seconds=self.max_wait)
+        claimed = await claim_tasks(db, limit, self.weights, dict(self._offsets), aged_before)
+        self._advance(Counter(priority for _, priority in claimed))
+
+        return [task_id for task_id, _ in claimed]
+
+
+scheduler = LaneScheduler(
+    {
+        Priority.INTERACTIVE: configs.scheduler.INTERACTIVE_WEIGHT,
+        Priority.BULK: configs.scheduler.BULK_WEIGHT,
+    },
+    configs.scheduler.MAX_WAIT,
+)
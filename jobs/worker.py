@@ -0,0 +1,136 @@
+import asyncio
+import time
+from uuid import UUID
+
+from sqlalchemy import select
+
+from configs import configs
+from database import LocalAsyncSession
+from database.models import Task
+from routers.utils.tasks import start_task
+from service_logging import hot_logger, logger
+from service_metrics import tasks_in_flight
+
+from .queue import recover_tasks, renew_leases
+from .scheduler import scheduler
+
+
+class Worker:
+    """Пул обработчиков, разбирающий очередь задач из БД.
+
+    Одновременно выполняется не более `concurrency` пайплайнов. Новые
+    задачи забираются при освобождении слота или по истечении интервала
+    опроса очереди. Порядок захвата задач определяет планировщик полос
+    приоритета.
+
+    На выполняемые задачи обработчик держит аренду, продлевая ее одним
+    запросом каждую треть `MANAGER_WORKER_LEASE_TTL`. При запуске и далее
+    раз в `MANAGER_WORKER_LEASE_TTL` секунд он забирает незавершенные задачи
+    с истекшей арендой, оставшиеся после аварийно завершившихся обработчиков,
+    и продолжает их с последнего сохраненного этапа.
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float) -> None:
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._pipelines: set[asyncio.Task] = set()
+        self._leases: dict[UUID, int] = {}
+        self._wakeup = asyncio.Event()
+        self._stopped = asyncio.Event()
+
+    def wakeup(self) -> None:
+        """Прерывает ожидание и инициирует немедленный опрос очереди."""
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        """Останавливает прием новых задач. Уже запущенные пайплайны дорабатывают."""
+        self._stopped.set()
+        self._wakeup.set()
+
+    async def _process(self, task_id: UUID) -> None:
+        tasks_in_flight.inc()
+        try:
+            async with LocalAsyncSession() as db:
+                task_obj = await db.execute(select(Task).where(Task.id == task_id))
+                task_obj = task_obj.scalar_one()
+
+            self._leases[task_id] = task_obj.attempts
+            await start_task(task_obj)
+
+        finally:
+            self._leases.pop(task_id, None)
+            tasks_in_flight.dec()
+
+    def _spawn(self, task_id: UUID) -> None:
+        pipeline = asyncio.create_task(self._process(task_id))
+        self._pipelines.add(pipeline)
+        pipeline.add_done_callback(self._on_done)
+
+    def _on_done(self, pipeline: asyncio.Task) -> None:
+        self._pipelines.discard(pipeline)
+        self._wakeup.set()
+
+        if not pipeline.cancelled() and pipeline.exception():
+            logger.error(f"Pipeline crashed: {pipeline.exception()}")
+
+    async def _claim(self, limit: int) -> list[UUID]:
+        try:
+            async with LocalAsyncSession() as db:
+                return await scheduler.claim(db, limit)
+
+        except Exception as error:
+            logger.error(f"Failed to claim tasks: {error}")
+            return []
+
+    async def _recover(self, limit: int) -> list[UUID]:
+        try:
+            async with LocalAsyncSession() as db:
+                return await recover_tasks(db, limit)
+
+        except Exception as error:
+            logger.error(f"Failed to recover tasks: {error}")
+            return []
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(configs.worker.LEASE_TTL / 3)
+            if not self._leases:
+                continue
+
+            try:
+                async with LocalAsyncSession() as db:
+                    await renew_leases(db, dict(self._leases))
+
+            except Exception as error:
+                logger.error(f"Failed to renew task leases: {error}")
+
+    async def run(self) -> None:
+        """Запускает цикл разбора очереди до вызова `stop`."""
+        logger.info(f"Worker started with concurrency {self.concurrency}.")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        recovered_at = float("-inf")
+        while not self._stopped.is_set():
+            free_slots = self.concurrency - len(self._pipelines)
+            if free_slots > 0 and time.monotonic() - recovered_at >= configs.worker.LEASE_TTL:
+                recovered_at = time.monotonic()
+                for task_id in await self._recover(free_slots):
+                    logger.warning(f"Recovering orphaned task: {task_id}")
+                    self._spawn(task_id)
+
+                free_slots = self.concurrency - len(self._pipelines)
+
+            if free_slots > 0:
+                for task_id in await self._claim(free_slots):
+                    hot_logger.info(f"Task claimed: {task_id}")
+                    self._spawn(task_id)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+        logger.info(f"Worker stopping, waiting for {len(self._pipelines)} pipelines...")
+        await asyncio.gather(*self._pipelines, return_exceptions=True)
+        heartbeat.cancel()
+        logger.info("Worker stopped.")
@@ -0,0 +1,30 @@
+import asyncio
+
+from configs import configs
+from database import LocalAsyncSession, disconnect_db
+from jobs import archive_partitions, create_partitions, purge_idempotency_keys
+from service_logging import logger
+
+
+async def main():
+    try:
+        async with LocalAsyncSession() as db:
+            created = await create_partitions(db, configs.partitions.MONTHS_AHEAD)
+            logger.info(f"Partitions created: {created or 'none'}")
+
+            if configs.partitions.RETENTION_MONTHS > 0:
+                archived = await archive_partitions(
+                    db, configs.partitions.RETENTION_MONTHS, configs.partitions.ARCHIVE_PATH
+                )
+                logger.info(f"Partitions archived: {archived or 'none'}")
+
+            purged = await purge_idempotency_keys(db)
+            logger.info(f"Expired idempotency keys purged: {purged}")
+
+    finally:
+        await disconnect_db()
+        await logger.complete()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+"""task checkpoints
+
+Revision ID: 0d7e9a4b5c21
+Revises: f2b8d4c6a013
+Create Date: 2026-10-18 18:42:19.073316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0d7e9a4b5c21"
+down_revision: Union[str, None] = "f2b8d4c6a013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+checkpoint = postgresql.ENUM("PREPROCESSED", "TRANSCRIBED", name="checkpoint")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    checkpoint.create(op.get_bind(), checkfirst=True)
+    op.add_column("tasks", sa.Column("checkpoint", checkpoint, nullable=True))
+    op.add_column("tasks", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("tasks", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.create_index(
+        "task_lease_idx",
+        "tasks",
+        ["lease_expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status NOT IN ('CREATED', 'COMPLETED', 'FAILED')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "task_lease_idx",
+        table_name="tasks",
+        postgresql_where=sa.text("status NOT IN ('CREATED', 'COMPLETED', 'FAILED')"),
+    )
+    op.drop_column("tasks", "attempts")
+    op.drop_column("tasks", "lease_expires_at")
+    op.drop_column("tasks", "checkpoint")
+    checkpoint.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""task list index
+
+Revision ID: 2e6d0f8b41c9
+Revises: 9b3f1c2a7e44
+Create Date: 2026-10-18 11:03:17.274190
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2e6d0f8b41c9"
+down_revision: Union[str, None] = "9b3f1c2a7e44"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "task_user_id_created_at_idx",
+        "tasks",
+        ["user_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("task_user_id_created_at_idx", table_name="tasks")
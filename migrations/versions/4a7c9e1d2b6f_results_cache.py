@@ -0,0 +1,40 @@
+"""results cache
+
+Revision ID: 4a7c9e1d2b6f
+Revises: 2e6d0f8b41c9
+Create Date: 2026-10-18 11:48:52.119034
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4a7c9e1d2b6f"
+down_revision: Union[str, None] = "2e6d0f8b41c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tasks", sa.Column("audio_hash", sa.String(length=64), nullable=True))
+    op.create_table(
+        "results_cache",
+        sa.Column("audio_hash", sa.String(length=64), nullable=False),
+        sa.Column("text_id", sa.UUID(), nullable=False),
+        sa.Column("result", sa.TEXT(), nullable=True),
+        sa.Column("accuracy", sa.Float(precision=3), nullable=True),
+        sa.Column("mistakes", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("audio_hash", "text_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("results_cache")
+    op.drop_column("tasks", "audio_hash")
@@ -0,0 +1,39 @@
+"""active tasks index
+
+Revision ID: 6f1e3b8a9d27
+Revises: 4a7c9e1d2b6f
+Create Date: 2026-10-18 13:20:05.641882
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f1e3b8a9d27"
+down_revision: Union[str, None] = "4a7c9e1d2b6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "task_active_idx",
+        "tasks",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("status NOT IN ('COMPLETED', 'FAILED')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "task_active_idx",
+        table_name="tasks",
+        postgresql_where=sa.text("status NOT IN ('COMPLETED', 'FAILED')"),
+    )
@@ -0,0 +1,37 @@
+"""task queue
+
+Revision ID: 9b3f1c2a7e44
+Revises: c7e1b585e358
+Create Date: 2026-10-18 10:12:41.508213
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3f1c2a7e44"
+down_revision: Union[str, None] = "c7e1b585e358"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "task_queue_idx",
+        "tasks",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'CREATED'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "task_queue_idx", table_name="tasks", postgresql_where=sa.text("status = 'CREATED'")
+    )
@@ -0,0 +1,159 @@
+"""partition tasks by month
+
+Revision ID: b83d5a0c6e12
+Revises: 6f1e3b8a9d27
+Create Date: 2026-10-18 15:02:37.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b83d5a0c6e12"
+down_revision: Union[str, None] = "6f1e3b8a9d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, title, user_id, text_id, status, result, accuracy, mistakes, "
+    "created_at, completed_at, comment, audio_hash"
+)
+MONTHS_AHEAD = 3
+
+
+def _task_columns(mistakes_type: sa.types.TypeEngine) -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(length=50), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("text_id", sa.UUID(), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="status", create_type=False), nullable=False),
+        sa.Column("result", sa.TEXT(), nullable=True),
+        sa.Column("accuracy", sa.Float(precision=3), nullable=True),
+        sa.Column("mistakes", mistakes_type, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("comment", sa.TEXT(), nullable=True),
+        sa.Column("audio_hash", sa.String(length=64), nullable=True),
+        sa.CheckConstraint("accuracy >= 0.0 AND accuracy <= 100.0", name="check_accuracy"),
+    ]
+
+
+def _create_indexes() -> None:
+    op.create_index("task_text_id_idx", "tasks", ["text_id"], postgresql_using="hash")
+    op.create_index("task_user_id_idx", "tasks", ["user_id"], postgresql_using="hash")
+    op.create_index("task_user_id_created_at_idx", "tasks", ["user_id", sa.text("created_at DESC")])
+    op.create_index(
+        "task_active_idx",
+        "tasks",
+        ["user_id"],
+        postgresql_where=sa.text("status NOT IN ('COMPLETED', 'FAILED')"),
+    )
+    op.create_index(
+        "task_queue_idx", "tasks", ["created_at"], postgresql_where=sa.text("status = 'CREATED'")
+    )
+
+
+def _drop_indexes(table_name: str) -> None:
+    for index_name in (
+        "task_text_id_idx",
+        "task_user_id_idx",
+        "task_user_id_created_at_idx",
+        "task_active_idx",
+        "task_queue_idx",
+    ):
+        op.drop_index(index_name, table_name=table_name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("tasks", "tasks_legacy")
+    op.execute("ALTER TABLE tasks_legacy RENAME CONSTRAINT tasks_pkey TO tasks_legacy_pkey")
+    _drop_indexes("tasks_legacy")
+
+    op.create_table(
+        "tasks",
+        *_task_columns(postgresql.JSONB()),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+
+    # * Месячные разделы создаются от самой старой задачи до MONTHS_AHEAD месяцев вперед
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month timestamp := date_trunc(
+                'month',
+                coalesce((SELECT min(created_at) FROM tasks_legacy), now()) AT TIME ZONE 'UTC'
+            );
+        BEGIN
+            WHILE month <= date_trunc('month', now() AT TIME ZONE 'UTC')
+                + interval '{MONTHS_AHEAD} months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF tasks FOR VALUES FROM (%L) TO (%L)',
+                    'tasks_p' || to_char(month, 'YYYYMM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("CREATE TABLE tasks_default PARTITION OF tasks DEFAULT")
+
+    op.execute(
+        f"""
+        INSERT INTO tasks ({COLUMNS})
+        SELECT {COLUMNS.replace("mistakes", "mistakes::jsonb")} FROM tasks_legacy
+        """
+    )
+    op.drop_table("tasks_legacy")
+    _create_indexes()
+
+    op.alter_column(
+        "results_cache",
+        "mistakes",
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(),
+        postgresql_using="mistakes::jsonb",
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "results_cache",
+        "mistakes",
+        existing_type=postgresql.JSONB(),
+        type_=sa.JSON(),
+        postgresql_using="mistakes::json",
+        existing_nullable=True,
+    )
+
+    op.rename_table("tasks", "tasks_partitioned")
+    op.execute(
+        "ALTER TABLE tasks_partitioned RENAME CONSTRAINT tasks_pkey TO tasks_partitioned_pkey"
+    )
+    _drop_indexes("tasks_partitioned")
+
+    op.create_table(
+        "tasks",
+        *_task_columns(sa.JSON()),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        f"""
+        INSERT INTO tasks ({COLUMNS})
+        SELECT {COLUMNS.replace("mistakes", "mistakes::json")} FROM tasks_partitioned
+        """
+    )
+    op.drop_table("tasks_partitioned")
+    _create_indexes()
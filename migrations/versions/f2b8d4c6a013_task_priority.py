@@ -0,0 +1,37 @@
+"""task priority
+
+Revision ID: f2b8d4c6a013
+Revises: e5a1c3f7b920
+Create Date: 2026-10-18 17:21:08.615930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d4c6a013"
+down_revision: Union[str, None] = "e5a1c3f7b920"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+priority = postgresql.ENUM("INTERACTIVE", "BULK", name="priority")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    priority.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "tasks",
+        sa.Column("priority", priority, nullable=False, server_default="INTERACTIVE"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "priority")
+    priority.drop(op.get_bind(), checkfirst=True)
@@ -1,4 +1,5 @@
 from .health import router as health_router
+from .metrics import router as metrics_router
 from .tasks import router as tasks_router
 
-__all__ = ("health_router", "tasks_router")
+__all__ = ("health_router", "metrics_router", "tasks_router")
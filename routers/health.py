@@ -5,8 +5,13 @@ import socket
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import JSONResponse
 
+from configs.services import ServicesConfiguration
 from service_logging import logger
 
+from .utils.http_proxy import get_breaker
+from .utils.readiness import readiness
+from .utils.results_cache import results_cache
+
 router = APIRouter(prefix="/health")
 
 
@@ -16,13 +21,23 @@ async def health_check() -> JSONResponse:
 
     logger.info("Checking the service health...")
     try:
+        breakers = {
+            service_name: get_breaker(service_name).snapshot()
+            for service_name in ServicesConfiguration.model_fields
+        }
+        is_degraded = any(breaker["state"] != "closed" for breaker in breakers.values())
+
         health_status = {
-            "status": "healthy",
+            "status": "degraded" if is_degraded else "healthy",
             "system": {
                 "hostname": socket.gethostname(),
                 "os": platform.system(),
                 "os_version": platform.version(),
             },
+            "breakers": breakers,
+            "caches": {
+                "results": results_cache.stats(),
+            },
             "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         }
 
@@ -34,3 +49,14 @@ async def health_check() -> JSONResponse:
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Health check failed: {str(error)}",
         )
+
+
+@router.get(path="/ready", summary="Проверка готовности", tags=["Health"])
+async def readiness_check() -> JSONResponse:
+    """Сообщает, доступны ли база данных и связанные сервисы. Возвращает
+    последний результат фоновых проверок без обращения к зависимостям.
+    Если какая-либо зависимость недоступна, отвечает 503.
+    """
+    snapshot = readiness.snapshot()
+    status_code = status.HTTP_200_OK if snapshot["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(content=snapshot, status_code=status_code)
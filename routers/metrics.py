@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from service_metrics import registry
+from service_metrics.server import CONTENT_TYPE
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get(path="", summary="Метрики сервиса", tags=["Metrics"])
+async def get_metrics() -> PlainTextResponse:
+    """Отдает метрики процесса в текстовом формате Prometheus."""
+
+    return PlainTextResponse(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,36 +1,45 @@
-from io import BytesIO
-from typing import Annotated, List
-from uuid import UUID
+from typing import Annotated
+from uuid import UUID, uuid4
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Body,
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Path,
     Request,
+    Response,
     UploadFile,
     status,
 )
-from sqlalchemy import select
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette.sse import EventSourceResponse
 
 from database import get_db
 from database.models import Task
+from database.notifications import notify_status, notify_statuses
+from database.types import Priority, Status
 from schemas.tasks import (
     CreateTaskResponse,
     DetailTaskRequest,
     DetailTaskResponse,
+    TasksPageResponse,
     TasksRequest,
-    TasksResponse,
 )
-from service_logging import logger
+from service_logging import hot_logger, logger
+from service_metrics import tasks_finished
+from storage import blobs
 
-from .utils.tasks import start_task, stream_task
+from .utils.admission import admission
+from .utils.detail_cache import build_etag, detail_cache, etag_matches
+from .utils.idempotency import claim_idempotency_key
+from .utils.pagination import decode_cursor, encode_cursor
+from .utils.serialization import JSONBytesResponse, dump_tasks_page
+from .utils.tasks import current_status, prepare_task, stream_task, stream_user_tasks
 
 router = APIRouter()
 
@@ -41,25 +50,47 @@ async def create_task(
     title: Annotated[str, Form(...)],
     user_id: Annotated[UUID, Form(...)],
     text_id: Annotated[UUID, Form(...)],
-    background: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(get_db)],
+    priority: Annotated[Priority, Form()] = Priority.INTERACTIVE,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=255)] = None,
 ) -> CreateTaskResponse:
     """Создаёт задачу на предобработку и транскрибирование аудиофайла.
-    Возвращает UUID созданой задачи с ответом 200, выполняя её в фоне.
+    Возвращает UUID созданой задачи с ответом 200, ставя её в очередь
+    на выполнение обработчиками. При перегрузке отвечает 429 или 503
+    с заголовками `Retry-After` и `X-Queue-Depth`. Задача, результат
+    которой найден в кеше, лимитам незавершенных задач не подлежит.
+
+    Если передан заголовок `Idempotency-Key`, повторный запрос пользователя
+    с тем же ключом возвращает UUID ранее созданной задачи, не создавая
+    новую и не ставя её в очередь.
+
+    Задачи по умолчанию попадают в интерактивную полосу приоритета.
     """
     logger.info("Creating a pronunciation assessment task...")
-    created_task = Task(
-        title=title,
-        user_id=user_id,
-        text_id=text_id,
-    )
+    task_id = uuid4()
+    if idempotency_key:
+        existing_id = await claim_idempotency_key(db, user_id, idempotency_key, task_id)
+        if existing_id:
+            await db.rollback()
+            logger.info(f"Idempotent retry, returning the existing task: {existing_id}")
+            return CreateTaskResponse(id=existing_id)
+
+    created_task = Task(**await prepare_task(file, title, user_id, text_id, db, task_id, priority))
 
-    db.add(created_task)
-    await db.commit()
-    await db.refresh(created_task)
+    try:
+        if created_task.status != Status.COMPLETED:
+            await admission.admit(db, user_id)
 
-    bytestream = BytesIO(await file.read())
-    background.add_task(start_task, bytestream, created_task, db)
+        db.add(created_task)
+        await notify_status(db, created_task)
+        await db.commit()
+
+    except Exception:
+        await blobs.delete(created_task.id)
+        raise
+
+    if created_task.status == Status.COMPLETED:
+        tasks_finished.inc(status=created_task.status.value)
 
     item = CreateTaskResponse.model_validate(created_task)
     logger.success(f"Task has been created: {item.id}")
@@ -67,37 +98,169 @@ async def create_task(
     return item
 
 
+@router.post("/transcribe/bulk", summary="Создать пакет задач на обработку аудио файлов")
+async def create_tasks(
+    files: Annotated[list[UploadFile], File(...)],
+    titles: Annotated[list[str], Form(...)],
+    user_id: Annotated[UUID, Form(...)],
+    text_ids: Annotated[list[UUID], Form(...)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    priority: Annotated[Priority, Form()] = Priority.BULK,
+) -> list[CreateTaskResponse]:
+    """Создаёт задачи на обработку нескольких аудиофайлов одним запросом.
+    Название и идентификатор текста сопоставляются файлам по порядку.
+    Все задачи вставляются одним запросом и ставятся в очередь вместе.
+
+    Задачи по умолчанию попадают в фоновую полосу приоритета и не
+    задерживают интерактивные задачи других пользователей.
+    """
+    if not len(files) == len(titles) == len(text_ids):
+        detail = "The number of files, titles and text_ids must match."
+        logger.error(detail)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=detail,
+        )
+
+    logger.info(f"Creating {len(files)} pronunciation assessment tasks...")
+    rows = []
+    try:
+        for file, title, text_id in zip(files, titles, text_ids):
+            rows.append(await prepare_task(file, title, user_id, text_id, db, priority=priority))
+
+        # * Задачи с результатом из кеша в очередь не попадают и лимитам не подлежат
+        queued = sum(row["status"] != Status.COMPLETED for row in rows)
+        if queued:
+            await admission.admit(db, user_id, count=queued)
+
+        stmt = insert(Task).values(rows).returning(Task.id)
+        created_ids = await db.execute(stmt)
+        created_ids = created_ids.scalars().all()
+        await notify_statuses(db, [(row["id"], user_id, row["status"]) for row in rows])
+        await db.commit()
+
+    except Exception:
+        for row in rows:
+            await blobs.delete(row["id"])
+        raise
+
+    for row in rows:
+        if row["status"] == Status.COMPLETED:
+            tasks_finished.inc(status=row["status"].value)
+
+    items = [CreateTaskResponse(id=task_id) for task_id in created_ids]
+    logger.success(f"Tasks have been created: {len(items)}")
+
+    return items
+
+
 # * GET был заменен на POST ради Body
-@router.post("/", summary="Получить список задач")
+@router.post(
+    "/",
+    summary="Получить список задач",
+    response_model=TasksPageResponse,
+)
 async def get_tasks(
     data: Annotated[TasksRequest, Body(...)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> List[TasksResponse]:
-    """Получает список всех задач, когда либо созданных в системе ILPS."""
+) -> JSONBytesResponse:
+    """Получает страницу задач пользователя, когда либо созданных в системе ILPS.
+    Задачи упорядочены от новых к старым, следующая страница запрашивается
+    по курсору `next_cursor` из предыдущего ответа.
+
+    Ответ сериализуется напрямую из строк выборки, минуя построение
+    моделей Pydantic для каждой задачи.
+    """
+
+    hot_logger.info("Getting the task list...")
+    stmt = (
+        select(Task.id, Task.status, Task.title, Task.accuracy, Task.created_at)
+        .where(Task.user_id == data.user_id)
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(data.limit + 1)
+    )
+
+    if data.cursor:
+        created_at, task_id = decode_cursor(data.cursor)
+        stmt = stmt.where(tuple_(Task.created_at, Task.id) < tuple_(created_at, task_id))
+
+    if data.status:
+        stmt = stmt.where(Task.status == data.status)
+
+    if data.created_from:
+        stmt = stmt.where(Task.created_at >= data.created_from)
+
+    if data.created_to:
+        stmt = stmt.where(Task.created_at < data.created_to)
 
-    logger.info("Getting the task list...")
-    stmt = select(Task).where(Task.user_id == data.user_id).order_by(Task.created_at.desc())
     tasks = await db.execute(stmt)
-    tasks = tasks.scalars().all()
+    tasks = tasks.all()
 
-    items = [TasksResponse.model_validate(task) for task in tasks]
-    logger.success(f"Received {len(items)} tasks.")
+    next_cursor = None
+    if len(tasks) > data.limit:
+        tasks = tasks[: data.limit]
+        next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
 
-    return items
+    items = [task._asdict() for task in tasks]
+    for item in items:
+        item["status"] = current_status(item["id"], item["status"])
+    hot_logger.success(f"Received {len(items)} tasks.")
+
+    return JSONBytesResponse(dump_tasks_page(items, next_cursor))
+
+
+@router.post("/stream", summary="Получать обновления статусов всех задач пользователя потоком")
+async def monitor_tasks(
+    request: Request,
+    data: Annotated[DetailTaskRequest, Body(...)],
+) -> EventSourceResponse:
+    """Получает информацию об обновлениях статусов всех незавершенных
+    задач пользователя в реальном времени через одно SSE соединение.
+    Задачи, созданные во время стрима, добавляются в него автоматически.
+    Стрим закрывается, когда у пользователя не остается незавершенных задач.
+    """
+
+    hot_logger.info("Streaming user tasks status updates....")
+    event_generator = stream_user_tasks(data.user_id, request)
+    return EventSourceResponse(event_generator)
+
+
+def _detail_response(body: bytes, etag: str, if_none_match: str | None) -> Response:
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    return JSONBytesResponse(body, headers={"ETag": etag})
 
 
 # * GET был заменен на POST ради Body
-@router.post("/{uuid}", summary="Получить актуальную информацию о задаче")
+@router.post(
+    "/{uuid}",
+    summary="Получить актуальную информацию о задаче",
+    response_model=DetailTaskResponse,
+)
 async def get_task(
     uuid: Annotated[UUID, Path(...)],
     data: Annotated[DetailTaskRequest, Body(...)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> DetailTaskResponse:
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     """Получает текущую информацию по UUID указаной задачи.
     Возвращает полную информацию о задача.
+
+    Ответ содержит заголовок ETag. Если клиент передал совпадающий
+    If-None-Match, возвращается 304 без тела. Ответы по завершенным
+    задачам кешируются в памяти процесса и отдаются без обращения к БД.
     """
 
-    logger.info("Getting information about a task...")
+    hot_logger.info("Getting information about a task...")
+    cache_key = (uuid, data.user_id)
+    cached = detail_cache.get(cache_key)
+
+    if cached:
+        hot_logger.success(f"Task found in cache: {uuid}")
+        return _detail_response(*cached, if_none_match)
+
+    # * Время создания по идентификатору неизвестно, поэтому проверяются индексы всех разделов
     stmt = select(Task).where((Task.id == uuid) & (Task.user_id == data.user_id))
     task = await db.execute(stmt)
     task = task.scalar_one_or_none()
@@ -111,9 +274,15 @@ async def get_task(
         )
 
     item = DetailTaskResponse.model_validate(task)
-    logger.success(f"Task found: {item.id}")
+    item.status = current_status(item.id, item.status)
+    hot_logger.success(f"Task found: {item.id}")
 
-    return item
+    body = item.model_dump_json().encode()
+    etag = build_etag(body)
+    if item.status in (Status.COMPLETED, Status.FAILED):
+        detail_cache.set(cache_key, (body, etag))
+
+    return _detail_response(body, etag, if_none_match)
 
 
 @router.post("/{uuid}/stream", summary="Получать обновления статуса задачи потоком")
@@ -127,7 +296,8 @@ async def monitor_task(
     в реальном времени, используя протокол SSE стриминга.
     """
 
-    logger.info("Getting information about a task...")
+    hot_logger.info("Getting information about a task...")
+    # * Время создания по идентификатору неизвестно, поэтому проверяются индексы всех разделов
     stmt = select(Task).where((Task.id == uuid) & (Task.user_id == data.user_id))
     task = await db.execute(stmt)
     task = task.scalar_one_or_none()
@@ -140,6 +310,6 @@ async def monitor_task(
             detail=detail,
         )
 
-    logger.info("Streaming task status updates....")
-    event_generator = stream_task(task, db, request)
+    hot_logger.info("Streaming task status updates....")
+    event_generator = stream_task(task, request)
     return EventSourceResponse(event_generator)
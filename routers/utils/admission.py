@@ -0,0 +1,189 @@
+import asyncio
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from configs import configs
+from database.models import Task
+from database.types import Status
+from service_logging import logger
+from service_metrics import admission_rejections
+
+TERMINAL_STATUSES = (Status.COMPLETED, Status.FAILED)
+
+
+class AdmissionController:
+    """Контроль допуска новых задач.
+
+    Ограничивает число одновременно принимаемых загрузок в процессе с
+    ограниченной очередью ожидания, а также общее число незавершенных
+    задач в системе и число незавершенных задач одного пользователя.
+    Лимиты по БД мягкие: параллельные запросы могут превысить их
+    на количество одновременно принимаемых загрузок.
+
+    Слот загрузки занимается до чтения тела запроса (`UploadAdmissionMiddleware`),
+    а лимиты незавершенных задач проверяются после проверки кеша результатов
+    только для задач, которые действительно попадут в очередь.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        max_active: int,
+        max_user_active: int,
+        max_concurrent: int,
+        queue_size: int,
+        queue_timeout: float,
+        retry_after: int,
+    ) -> None:
+        self.enabled = enabled
+        self.max_active = max_active
+        self.max_user_active = max_user_active
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+
+    def _reject(self, status_code: int, reason: str, detail: str, queue_depth: int) -> None:
+        logger.warning(detail)
+        admission_rejections.inc(reason=reason)
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after), "X-Queue-Depth": str(queue_depth)},
+        )
+
+    async def acquire_upload(self) -> None:
+        """Занимает слот загрузки, ожидая его в ограниченной очереди.
+
+        Raises:
+            HTTPException: 503. Очередь ожидания заполнена или ожидание истекло.
+        """
+        if not self.enabled:
+            return
+
+        if self._slots.locked() and self._waiting >= self.queue_size:
+            self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "upload_queue",
+                "Upload queue is full.",
+                self._waiting,
+            )
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+
+        except TimeoutError:
+            self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "upload_timeout",
+                "Timed out waiting for an upload slot.",
+                self._waiting,
+            )
+
+        finally:
+            self._waiting -= 1
+
+    def release_upload(self) -> None:
+        """Освобождает слот загрузки."""
+        if self.enabled:
+            self._slots.release()
+
+    async def _count_active(self, db: AsyncSession, user_id: UUID) -> tuple[int, int, int]:
+        stmt = select(
+            func.count().filter(Task.status == Status.CREATED),
+            func.count(),
+            func.count().filter(Task.user_id == user_id),
+        ).where(Task.status.not_in(TERMINAL_STATUSES))
+        counters = await db.execute(stmt)
+        return counters.one()
+
+    async def admit(self, db: AsyncSession, user_id: UUID, count: int = 1) -> None:
+        """Проверяет лимиты незавершенных задач перед постановкой новых задач в очередь.
+
+        Args:
+            db (AsyncSession): Обьект сессии базы данных.
+            user_id (UUID): Идентификатор пользователя.
+            count (int, optional): Количество создаваемых задач. Defaults to 1.
+
+        Raises:
+            HTTPException: 413. Задач в запросе больше, чем допускает любой из лимитов.
+            HTTPException: 429. Превышен лимит незавершенных задач пользователя.
+            HTTPException: 503. Система перегружена.
+        """
+        if not self.enabled:
+            return
+
+        # * Такой запрос не будет допущен никогда, поэтому повтор ему не предлагается
+        max_count = min(self.max_user_active, self.max_active)
+        if count > max_count:
+            detail = f"Too many tasks in one request: {count}, at most {max_count} allowed."
+            logger.warning(detail)
+            admission_rejections.inc(reason="request_too_large")
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+        queued, active, user_active = await self._count_active(db, user_id)
+
+        if user_active + count > self.max_user_active:
+            self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "user_limit",
+                f"Too many active tasks for user: {user_active}.",
+                queued,
+            )
+
+        if active + count > self.max_active:
+            self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "global_limit",
+                f"Too many active tasks: {active}.",
+                queued,
+            )
+
+
+admission = AdmissionController(
+    configs.admission.ENABLE,
+    configs.admission.MAX_ACTIVE_TASKS,
+    configs.admission.MAX_USER_ACTIVE_TASKS,
+    configs.admission.MAX_CONCURRENT_UPLOADS,
+    configs.admission.QUEUE_SIZE,
+    configs.admission.QUEUE_TIMEOUT,
+    configs.admission.RETRY_AFTER,
+)
+
+
+class UploadAdmissionMiddleware:
+    """ASGI middleware, занимающий слот загрузки до чтения тела запроса.
+
+    Применяется к POST запросам на пути `paths`. Если слот не получен,
+    запрос отклоняется с ответом 503, не читая загружаемые файлы.
+    """
+
+    def __init__(self, app: ASGIApp, paths: tuple[str, ...]) -> None:
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        try:
+            await admission.acquire_upload()
+
+        except HTTPException as error:
+            response = JSONResponse(
+                {"detail": error.detail}, status_code=error.status_code, headers=error.headers
+            )
+            return await response(scope, receive, send)
+
+        try:
+            await self.app(scope, receive, send)
+
+        finally:
+            admission.release_upload()
@@ -0,0 +1,126 @@
+import asyncio
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from configs import configs
+from service_logging import logger
+
+from .http_proxy import proxy_request
+
+
+@dataclass
+class BatchItem:
+    """Аудиофайл, ожидающий отправки в составе пакета."""
+
+    audio_file: BinaryIO
+    future: asyncio.Future
+
+
+class TranscriptionBatcher:
+    """Накопитель запросов на транскрибирование от параллельно
+    выполняющихся задач.
+
+    Аудиофайлы собираются в пакет в течение окна `window` секунд или
+    до `max_size` штук и отправляются на сервис транскрибирования одним
+    multipart запросом. Транскрипции возвращаются ожидающим задачам
+    в порядке отправки файлов.
+
+    Если ожидающая задача отменена, её файл исключается из пакета,
+    а остальные задачи пакета продолжают ожидать свои транскрипции.
+    """
+
+    def __init__(self, window: float, max_size: int, path: str) -> None:
+        self.window = window
+        self.max_size = max_size
+        self.path = path
+        self._pending: list[BatchItem] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._requests: set[asyncio.Task] = set()
+
+    async def transcribe(self, audio_file: BinaryIO) -> str:
+        """Добавляет аудиофайл в текущий пакет и ожидает его транскрипцию.
+
+        Args:
+            audio_file (BinaryIO): Поток байтов аудиофайла.
+
+        Returns:
+            str: Фонетическая запись текста.
+        """
+        loop = asyncio.get_running_loop()
+        item = BatchItem(audio_file, loop.create_future())
+        self._pending.append(item)
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        try:
+            return await item.future
+
+        except asyncio.CancelledError:
+            # * Файл отмененной задачи закрывается, поэтому он не должен попасть в пакет
+            if item in self._pending:
+                self._pending.remove(item)
+            raise
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        request = asyncio.create_task(self._send(batch))
+        self._requests.add(request)
+        request.add_done_callback(self._requests.discard)
+
+    async def _send(self, batch: list[BatchItem]) -> None:
+        # * Задачи могли быть отменены после формирования пакета. Файлы остальных
+        # * читаются до первого ожидания, пока их задачи не могут их закрыть
+        batch = [item for item in batch if not item.future.done()]
+        if not batch:
+            return
+
+        logger.info(f"Transcribing a batch of {len(batch)} audio files....")
+        try:
+            files = []
+            for index, item in enumerate(batch):
+                item.audio_file.seek(0)
+                content = item.audio_file.read()
+                files.append(("files", (f"audio_{index}.wav", content, "audio/wav")))
+
+            async with proxy_request("transcribing") as client:
+                response = await client.post(self.path, data={"lang": "english"}, files=files)
+                response.raise_for_status()
+
+                transcriptions = response.json()["transcriptions"]
+
+            if len(transcriptions) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} transcriptions, service returned {len(transcriptions)}"
+                )
+
+            for item, transcription in zip(batch, transcriptions):
+                if not item.future.done():
+                    item.future.set_result(transcription)
+
+        except Exception as error:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(error)
+
+        finally:
+            # * При отмене запроса задачи пакета иначе ожидали бы транскрипцию бесконечно
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(RuntimeError("Batch transcription was cancelled."))
+
+
+transcription_batcher = TranscriptionBatcher(
+    configs.batching.WINDOW,
+    configs.batching.MAX_SIZE,
+    configs.batching.PATH,
+)
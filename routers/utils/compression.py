@@ -0,0 +1,223 @@
+import zlib
+from typing import BinaryIO, Iterator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SUPPORTED_ENCODINGS = ("gzip", "zstd") if zstandard else ("gzip",)
+
+
+class DecompressedSizeExceeded(ValueError):
+    """Размер распакованных данных превышает допустимый."""
+
+
+class MalformedCompressedData(ValueError):
+    """Сжатые данные повреждены или обрываются до конца потока."""
+
+
+class _ChunkReader:
+    """Файлоподобная обертка над итератором частей для потокового чтения zstd."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self._buffer = chunk
+
+        if size < 0:
+            size = len(self._buffer)
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+ZSTD_MAGIC = 0xFD2FB528
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+
+def _iter_gzip(chunks: Iterator[bytes], chunk_size: int) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    for data in chunks:
+        while data:
+            # * Данные после конца члена gzip - следующий член, иначе поток поврежден
+            if decompressor.eof:
+                decompressor = zlib.decompressobj(GZIP_WBITS)
+
+            try:
+                chunk = decompressor.decompress(data, chunk_size)
+            except zlib.error as error:
+                raise MalformedCompressedData(f"Malformed gzip stream: {error}") from error
+
+            data = decompressor.unused_data if decompressor.eof else decompressor.unconsumed_tail
+            if chunk:
+                yield chunk
+
+    if tail := decompressor.flush():
+        yield tail
+
+    if not decompressor.eof:
+        raise MalformedCompressedData("Compressed data ends before the end of the gzip stream.")
+
+
+class _ZstdFrames:
+    """Отслеживает границы кадров zstd по их заголовкам, не распаковывая данные."""
+
+    # * Размер очередного заголовка для каждого состояния разбора
+    _HEADER_SIZES = {"magic": 4, "skippable": 4, "descriptor": 1, "block": 3}
+
+    def __init__(self) -> None:
+        self._state = "magic"
+        self._header = b""
+        self._skip = 0
+        self._checksum = False
+        self.frames = 0
+
+    @property
+    def complete(self) -> bool:
+        """Данные заканчиваются на границе кадра и содержат хотя бы один кадр."""
+        return self.frames > 0 and self._state == "magic" and not self._header and not self._skip
+
+    def feed(self, data: bytes) -> None:
+        """Разбирает очередную часть сжатых данных.
+
+        Args:
+            data (bytes): Часть сжатых данных.
+
+        Raises:
+            MalformedCompressedData: Данные не являются потоком кадров zstd.
+        """
+        offset = 0
+        while offset < len(data):
+            if self._skip:
+                skipped = min(self._skip, len(data) - offset)
+                self._skip -= skipped
+                offset += skipped
+                continue
+
+            needed = self._HEADER_SIZES[self._state] - len(self._header)
+            self._header += data[offset : offset + needed]
+            offset += needed
+            if len(self._header) == self._HEADER_SIZES[self._state]:
+                self._parse(int.from_bytes(self._header, "little"))
+                self._header = b""
+
+    def _parse(self, header: int) -> None:
+        if self._state == "magic":
+            if header == ZSTD_MAGIC:
+                self._state = "descriptor"
+            elif header & 0xFFFFFFF0 == ZSTD_SKIPPABLE_MAGIC:
+                self._state = "skippable"
+            else:
+                raise MalformedCompressedData("Unknown zstd frame magic number.")
+
+        elif self._state == "skippable":
+            self._skip = header
+            self._state = "magic"
+
+        elif self._state == "descriptor":
+            if header & 0x08:
+                raise MalformedCompressedData("Reserved bit of the zstd frame header is set.")
+
+            single_segment = header >> 5 & 1
+            self._checksum = bool(header >> 2 & 1)
+            self._skip = (
+                (1 - single_segment)
+                + (0, 1, 2, 4)[header & 3]
+                + (single_segment, 2, 4, 8)[header >> 6]
+            )
+            self._state = "block"
+
+        else:
+            block_type = header >> 1 & 3
+            if block_type == 3:
+                raise MalformedCompressedData("Reserved zstd block type.")
+
+            # * Блок RLE хранит один повторяемый байт
+            self._skip = 1 if block_type == 1 else header >> 3
+            if header & 1:
+                self._skip += 4 if self._checksum else 0
+                self._state = "magic"
+                self.frames += 1
+
+
+def _iter_zstd(chunks: Iterator[bytes], chunk_size: int) -> Iterator[bytes]:
+    frames = _ZstdFrames()
+
+    def tracked() -> Iterator[bytes]:
+        for data in chunks:
+            frames.feed(data)
+            yield data
+
+    source = _ChunkReader(tracked())
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        source, read_size=chunk_size, read_across_frames=True
+    )
+    while chunk := reader.read(chunk_size):
+        yield chunk
+
+    # * Потоковое чтение не сообщает об оборванном кадре, поэтому границы проверяются отдельно
+    while source.read():
+        pass
+
+    if not frames.complete:
+        raise MalformedCompressedData("Compressed data ends before the end of the zstd frame.")
+
+
+def iter_decompressed(
+    chunks: Iterator[bytes], encoding: str, limit: int, chunk_size: int
+) -> Iterator[bytes]:
+    """Распаковывает поток частей, не допуская превышения `limit` байт.
+
+    Распаковка выполняется частями не больше `chunk_size` байт, поэтому
+    сильно сжатые данные не разворачиваются в памяти целиком.
+
+    Args:
+        chunks (Iterator[bytes]): Части сжатых данных.
+        encoding (str): Кодирование данных, `gzip` или `zstd`.
+        limit (int): Максимальный размер распакованных данных.
+        chunk_size (int): Максимальный размер части распакованных данных.
+
+    Raises:
+        ValueError: Кодирование не поддерживается.
+        DecompressedSizeExceeded: Распакованные данные больше `limit` байт.
+        MalformedCompressedData: Сжатые данные повреждены или оборваны.
+
+    Yields:
+        Iterator[bytes]: Части распакованных данных.
+    """
+    if encoding == "gzip":
+        decompressed = _iter_gzip(chunks, chunk_size)
+    elif encoding == "zstd" and zstandard is not None:
+        decompressed = _iter_zstd(chunks, chunk_size)
+    else:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+
+    total = 0
+    for chunk in decompressed:
+        total += len(chunk)
+        if total > limit:
+            raise DecompressedSizeExceeded(f"Decompressed size exceeds {limit} bytes.")
+        yield chunk
+
+
+def read_chunks(source: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Читает файловый объект частями с начала.
+
+    Args:
+        source (BinaryIO): Файловый объект.
+        chunk_size (int): Размер части.
+
+    Yields:
+        Iterator[bytes]: Части содержимого.
+    """
+    source.seek(0)
+    while chunk := source.read(chunk_size):
+        yield chunk
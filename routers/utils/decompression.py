@@ -0,0 +1,105 @@
+import asyncio
+from typing import Iterator
+
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .compression import SUPPORTED_ENCODINGS, DecompressedSizeExceeded, iter_decompressed
+
+
+class RequestDecompressionMiddleware:
+    """ASGI middleware, распаковывающий тела запросов с заголовком `Content-Encoding`.
+
+    Тело распаковывается потоком по мере получения частями не больше
+    `chunk_size` байт. Распаковка выполняется в пуле потоков, который
+    запрашивает следующие сжатые части у цикла событий. Если распакованное
+    тело больше `limit` байт, запрос отклоняется с ответом 413, если сжатые
+    данные повреждены или оборваны - с ответом 400.
+    """
+
+    def __init__(self, app: ASGIApp, limit: int, chunk_size: int) -> None:
+        self.app = app
+        self.limit = limit
+        self.chunk_size = chunk_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = Headers(scope=scope).get("content-encoding", "").strip().lower()
+        if encoding in ("", "identity"):
+            return await self.app(scope, receive, send)
+
+        if encoding not in SUPPORTED_ENCODINGS:
+            response = JSONResponse(
+                {"detail": f"Unsupported content encoding: {encoding}."},
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+            return await response(scope, receive, send)
+
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        await self.app(scope, self._decompressing(receive, encoding), send)
+
+    def _decompressing(self, receive: Receive, encoding: str) -> Receive:
+        loop = asyncio.get_running_loop()
+        more_body = True
+        finished = False
+        disconnect: Message | None = None
+
+        async def receive_compressed() -> bytes | None:
+            nonlocal more_body, disconnect
+            if not more_body:
+                return None
+
+            message = await receive()
+            if message["type"] != "http.request":
+                disconnect = message
+                more_body = False
+                return None
+
+            more_body = message.get("more_body", False)
+            return message.get("body", b"")
+
+        def compressed_chunks() -> Iterator[bytes]:
+            while (
+                body := asyncio.run_coroutine_threadsafe(receive_compressed(), loop).result()
+            ) is not None:
+                yield body
+
+        decompressed = iter_decompressed(compressed_chunks(), encoding, self.limit, self.chunk_size)
+
+        async def receive_decompressed() -> Message:
+            nonlocal finished
+            if not finished:
+                try:
+                    chunk = await asyncio.to_thread(next, decompressed, None)
+
+                except DecompressedSizeExceeded as error:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Decompressed request body exceeds {self.limit} bytes.",
+                    ) from error
+
+                except Exception as error:
+                    if disconnect is not None:
+                        return disconnect
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Malformed compressed request body.",
+                    ) from error
+
+                if chunk is not None:
+                    return {"type": "http.request", "body": chunk, "more_body": True}
+
+                finished = True
+
+            return disconnect or {"type": "http.request", "body": b"", "more_body": False}
+
+        return receive_decompressed
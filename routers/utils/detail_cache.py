@@ -0,0 +1,36 @@
+import hashlib
+
+from configs import configs
+
+from .cache import LRUCache
+
+detail_cache = LRUCache(configs.cache.DETAIL_MAX_SIZE, configs.cache.DETAIL_TTL)
+
+
+def build_etag(body: bytes) -> str:
+    """Вычисляет ETag сериализованного ответа.
+
+    Args:
+        body (bytes): Тело ответа.
+
+    Returns:
+        str: Значение заголовка ETag.
+    """
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверяет, совпадает ли ETag с одним из значений заголовка If-None-Match.
+
+    Args:
+        if_none_match (str | None): Значение заголовка If-None-Match.
+        etag (str): ETag текущего ответа.
+
+    Returns:
+        bool: Клиент уже располагает актуальной версией ответа.
+    """
+    if not if_none_match:
+        return False
+
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
@@ -1,59 +1,164 @@
+import time
 from contextlib import asynccontextmanager
+from importlib.util import find_spec
 from json import JSONDecodeError
 from typing import AsyncGenerator
 
 from fastapi import HTTPException, status
-from httpx import AsyncClient, ConnectError, ConnectTimeout, HTTPStatusError
+from httpx import (
+    AsyncClient,
+    AsyncHTTPTransport,
+    ConnectError,
+    ConnectTimeout,
+    HTTPStatusError,
+    Limits,
+    Timeout,
+)
 
+from configs import configs
+from configs.services import ServiceConfiguration
 from service_logging import logger
+from service_metrics import downstream_request_duration
+
+from .resilience import CircuitBreaker, ResilientTransport
+
+_clients: dict[str, AsyncClient] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(service_name: str) -> CircuitBreaker:
+    """Возвращает предохранитель связанного сервиса.
+
+    Args:
+        service_name (str): Имя сервиса из `configs.services`.
+
+    Returns:
+        CircuitBreaker: Предохранитель сервиса.
+    """
+    breaker = _breakers.get(service_name)
+    if breaker is None:
+        service = getattr(configs.services, service_name)
+        breaker = CircuitBreaker(
+            service_name,
+            service.BREAKER_THRESHOLD,
+            service.BREAKER_RECOVERY,
+            service.BREAKER_MAX_WAIT,
+        )
+        _breakers[service_name] = breaker
+
+    return breaker
+
+
+def _create_client(service_name: str, service: ServiceConfiguration) -> AsyncClient:
+    http2 = service.HTTP2
+    if http2 and find_spec("h2") is None:
+        logger.warning(f"HTTP/2 for {service_name} requested, but 'h2' is not installed.")
+        http2 = False
+
+    transport = AsyncHTTPTransport(
+        http2=http2,
+        limits=Limits(
+            max_connections=service.MAX_CONNECTIONS,
+            max_keepalive_connections=service.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=service.KEEPALIVE_EXPIRY,
+        ),
+    )
+    return AsyncClient(
+        base_url=service.URL,
+        transport=ResilientTransport(
+            transport,
+            get_breaker(service_name),
+            service.RETRIES,
+            service.RETRY_BACKOFF,
+            service.RETRY_MAX_BACKOFF,
+        ),
+        timeout=Timeout(service.TIMEOUT, connect=service.CONNECT_TIMEOUT),
+    )
+
+
+def get_client(service_name: str) -> AsyncClient:
+    """Возвращает долгоживущий HTTP клиент связанного сервиса.
+    Клиент создается при первом обращении и переиспользует
+    keep-alive соединения между запросами.
+
+    Args:
+        service_name (str): Имя сервиса из `configs.services`.
+
+    Returns:
+        AsyncClient: Асинхронный клиент httpx.
+    """
+    client = _clients.get(service_name)
+    if client is None or client.is_closed:
+        service = getattr(configs.services, service_name)
+        client = _create_client(service_name, service)
+        _clients[service_name] = client
+
+    return client
+
+
+async def close_clients():
+    """Закрывает HTTP клиенты всех связанных сервисов, освобождает соединения."""
+    while _clients:
+        _, client = _clients.popitem()
+        await client.aclose()
 
 
 @asynccontextmanager
-async def proxy_request(service_url: str) -> AsyncGenerator[AsyncClient, None]:
+async def proxy_request(service_name: str) -> AsyncGenerator[AsyncClient, None]:
     """Асинхронный контекстный менеджер проксирования HTTP запросов
-    к связанным микросервисам по их URL. Выполняет автоматический
+    к связанным микросервисам по их имени. Выполняет автоматический
     отлов и проксирование ошибок, а также логирование хода запроса.
 
     Args:
-        service_url (str): URL адрес сервиса.
+        service_name (str): Имя сервиса из `configs.services`.
 
     Raises:
         HTTPException: Проксированная ошибка от сервиса.
-        HTTPException: 503. Ошибка подключения к сервису.
+        HTTPException: 503. Ошибка подключения к сервису или разомкнут его предохранитель.
 
     Yields:
         AsyncGenerator[AsyncClient, None]: Генератор асинхронного клиента httpx.
     """
+    client = get_client(service_name)
+    service_url = client.base_url
+
     logger.info(f"Proxying a service request to {service_url}")
-    async with AsyncClient(base_url=service_url) as client:
-        try:
-            yield client
+    started_at = time.perf_counter()
+    outcome = "error"
+    try:
+        yield client
+        outcome = "success"
+
+    except HTTPStatusError as error:
+        status_code = error.response.status_code
 
-        except HTTPStatusError as error:
-            status_code = error.response.status_code
+        try:
+            content = error.response.json()
+            detail = content.get("detail", "Unknown error")
 
-            try:
-                content = error.response.json()
-                detail = content.get("detail", "Unknown error")
+        except JSONDecodeError:
+            detail = error.response.content
 
-            except JSONDecodeError:
-                detail = error.response.content
+        message = f"Service at {service_url} returned an error respose: {detail}"
+        logger.error(message)
 
-            message = f"Service at {service_url} returned an error respose: {detail}"
-            logger.error(message)
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+        )
 
-            raise HTTPException(
-                status_code=status_code,
-                detail=detail,
-            )
+    except (ConnectError, ConnectTimeout) as error:
+        detail = str(error)
 
-        except (ConnectError, ConnectTimeout) as error:
-            detail = str(error)
+        message = f"Service at {service_url} is unavailable: {detail}"
+        logger.error(message)
 
-            message = f"Service at {service_url} is unavailable: {detail}"
-            logger.error(message)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+        )
 
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=detail,
-            )
+    finally:
+        downstream_request_duration.observe(
+            time.perf_counter() - started_at, service=service_name, outcome=outcome
+        )
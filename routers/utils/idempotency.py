@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import configs
+from database.models import IdempotencyKey
+
+
+async def claim_idempotency_key(
+    db: AsyncSession, user_id: UUID, key: str, task_id: UUID
+) -> UUID | None:
+    """Закрепляет ключ идемпотентности за новой задачей в рамках текущей транзакции.
+
+    Вставка выполняется через INSERT ... ON CONFLICT, поэтому из параллельных
+    запросов с одинаковым ключом ключ получает только один: остальные ждут
+    завершения его транзакции и получают идентификатор его задачи. Если
+    транзакция откатывается, ключ освобождается вместе с ней. Ключ с истекшим
+    сроком действия перезаписывается.
+
+    Args:
+        db (AsyncSession): Обьект сессии базы данных.
+        user_id (UUID): Идентификатор пользователя.
+        key (str): Значение заголовка `Idempotency-Key`.
+        task_id (UUID): Идентификатор создаваемой задачи.
+
+    Returns:
+        UUID | None: Идентификатор ранее созданной задачи или None, если ключ
+            закреплен за новой задачей.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = insert(IdempotencyKey).values(
+        user_id=user_id,
+        key=key,
+        task_id=task_id,
+        created_at=now,
+        expires_at=now + timedelta(seconds=configs.idempotency.TTL),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+        set_={
+            "task_id": stmt.excluded.task_id,
+            "created_at": stmt.excluded.created_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=IdempotencyKey.expires_at <= now,
+    ).returning(IdempotencyKey.task_id)
+
+    claimed = await db.execute(stmt)
+    if claimed.scalar_one_or_none() is not None:
+        return None
+
+    stmt = select(IdempotencyKey.task_id).where(
+        (IdempotencyKey.user_id == user_id) & (IdempotencyKey.key == key)
+    )
+    existing = await db.execute(stmt)
+    return existing.scalar_one()
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, task_id: UUID) -> str:
+    """Кодирует позицию последней задачи страницы в непрозрачный курсор.
+
+    Args:
+        created_at (datetime): Время создания задачи.
+        task_id (UUID): Идентификатор задачи.
+
+    Returns:
+        str: Курсор следующей страницы.
+    """
+    raw = json.dumps([created_at.isoformat(), str(task_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Декодирует курсор страницы в ключ `(created_at, id)`.
+
+    Args:
+        cursor (str): Курсор, полученный с предыдущей страницей.
+
+    Raises:
+        HTTPException: 400. Некорректный курсор.
+
+    Returns:
+        tuple[datetime, UUID]: Ключ последней задачи предыдущей страницы.
+    """
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(task_id)
+
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        )
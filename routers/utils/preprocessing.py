@@ -1,6 +1,6 @@
-from io import BytesIO
-
-from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, BinaryIO
 
 from configs import configs
 from database.models import Task
@@ -8,33 +8,63 @@ from database.types import Status
 from service_logging import logger
 
 from .http_proxy import proxy_request
+from .status import update_status
+
+
+@asynccontextmanager
+async def stream_preprocessed_audio(
+    upload: tuple[str, BinaryIO, str], task_obj: Task
+) -> AsyncIterator[AsyncIterator[bytes]]:
+    """Асинхронный контекстный менеджер, передающий поток байтов аудиофайла
+    на сервис предобработки и отдающий ответ сервиса частями по мере получения,
+    параллельно меняя статус задачи.
 
+    Args:
+        upload (tuple[str, BinaryIO, str]): Имя, поток байтов и тип содержимого аудиофайла.
+        task_obj (Task): Обьект ORM задачи.
+
+    Yields:
+        AsyncIterator[AsyncIterator[bytes]]: Итератор частей обработанного аудиофайла.
+    """
+    await update_status(task_obj, Status.PREPROCESSING)
 
-async def preprocess_audio(audio_file: BytesIO, task_obj: Task, db: AsyncSession) -> BytesIO:
+    logger.info("Preprocessing audio file....")
+    async with proxy_request("preprocessing") as client:
+        upload[1].seek(0)
+        request = client.stream("POST", "/", files={"file": upload})
+        async with request as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+
+            yield response.aiter_bytes(configs.storage.CHUNK_SIZE)
+
+
+async def preprocess_audio(upload: tuple[str, BinaryIO, str], task_obj: Task) -> BinaryIO:
     """Функция передает поток байтов аудиофайла на сервис предобработки,
     параллельно меняя статус задачи.
 
     Функция при помощи сервиса предобработки возвращает поток байтов
     аудиофайла с изменеными значениями и свойств аудио: Частота дискретизации, усиление и т.п.
 
+    Аудиофайл отправляется и принимается частями: ответ сервиса пишется
+    во временный файл, который остается в памяти только до
+    `MANAGER_STORAGE_SPOOL_MAX_SIZE` байт.
+
+    Сжатые аудиоконтейнеры и, если сервис их принимает, сжатые файлы
+    передаются без распаковки.
+
     Args:
-        audio_file (BytesIO): Поток байтов аудиофайала.
+        upload (tuple[str, BinaryIO, str]): Имя, поток байтов и тип содержимого аудиофайла.
         task_obj (Task): Обьект ORM задачи.
-        db (AsyncSession): Обьект сессии базы данных.
 
     Returns:
-        BytesIO: Поток байтов обработанного аудиофайла.
+        BinaryIO: Поток байтов обработанного аудиофайла.
     """
-    task_obj.status = Status.PREPROCESSING
-    await db.commit()
+    preprocessed_file = SpooledTemporaryFile(max_size=configs.storage.SPOOL_MAX_SIZE)
+    async with stream_preprocessed_audio(upload, task_obj) as chunks:
+        async for chunk in chunks:
+            preprocessed_file.write(chunk)
 
-    logger.info("Preprocessing audio file....")
-    async with proxy_request(configs.services.preprocessing.URL) as client:
-        response = await client.post(
-            "/",
-            files={"file": ("audio.pcm", audio_file.getvalue(), "application/octet-stream")},
-            timeout=60.0,
-        )
-        response.raise_for_status()
-
-        return BytesIO(response.content)
+    preprocessed_file.seek(0)
+    return preprocessed_file
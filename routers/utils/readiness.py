@@ -0,0 +1,156 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from httpx import AsyncClient, Limits, Timeout
+from sqlalchemy import text
+
+from configs import configs
+from configs.services import ServicesConfiguration
+from database import engine
+from service_logging import logger
+
+from .http_proxy import get_client
+
+DATABASE_PROBE = "database"
+
+
+async def _probe_database() -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+_probe_clients: dict[str, AsyncClient] = {}
+
+
+def _get_probe_client(service_name: str) -> AsyncClient:
+    # * Проверки идут через отдельный клиент, чтобы не влиять на предохранитель сервиса
+    client = _probe_clients.get(service_name)
+    if client is None:
+        service = getattr(configs.services, service_name)
+        client = AsyncClient(
+            base_url=service.URL,
+            limits=Limits(max_connections=1, max_keepalive_connections=1),
+            timeout=Timeout(configs.readiness.TIMEOUT),
+        )
+        _probe_clients[service_name] = client
+
+    return client
+
+
+async def _probe_service(service_name: str) -> None:
+    health_path = getattr(configs.services, service_name).HEALTH_PATH
+    response = await _get_probe_client(service_name).get(health_path)
+    response.raise_for_status()
+
+
+async def _warm_up_service(service_name: str) -> None:
+    health_path = getattr(configs.services, service_name).HEALTH_PATH
+    response = await get_client(service_name).get(health_path, extensions={"breaker": False})
+    response.raise_for_status()
+
+
+class ReadinessProbe:
+    """Кешированные проверки доступности зависимостей сервиса.
+
+    Проверки базы данных и связанных сервисов выполняются в фоне раз в
+    `interval` секунд, а эндпоинт готовности только читает их последний
+    результат, поэтому частые запросы оркестратора не создают нагрузки.
+
+    Сервисы проверяются запросом на `MANAGER_SERVICE_<NAME>_HEALTH_PATH`
+    через отдельные клиенты, поэтому проверки не влияют на предохранители,
+    защищающие обращения пайплайна.
+    """
+
+    def __init__(self, interval: float, timeout: float) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self._probes: dict[str, Callable[[], Awaitable[None]]] = {DATABASE_PROBE: _probe_database}
+        for service_name in ServicesConfiguration.model_fields:
+            self._probes[service_name] = lambda name=service_name: _probe_service(name)
+
+        self._results: dict[str, dict[str, Any]] = {}
+        self._refresher: asyncio.Task | None = None
+
+    async def _run_probe(self, name: str) -> None:
+        started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._probes[name](), timeout=self.timeout)
+            result = {"ready": True}
+
+        except Exception as error:
+            result = {"ready": False, "error": str(error) or type(error).__name__}
+
+        result["latency"] = round(time.perf_counter() - started_at, 4)
+        result["checked_at"] = time.time()
+        if self._results.get(name, {}).get("ready") != result["ready"]:
+            log = logger.info if result["ready"] else logger.warning
+            log(f"Dependency '{name}' ready: {result['ready']}")
+
+        self._results[name] = result
+
+    async def refresh(self) -> None:
+        """Выполняет все проверки одновременно и обновляет их результаты."""
+        await asyncio.gather(*(self._run_probe(name) for name in self._probes))
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    async def warm_up(self, db_connections: int, http_connections: int) -> None:
+        """Заранее открывает соединения пула БД и keep-alive соединения
+        со связанными сервисами, затем выполняет первую проверку.
+
+        Args:
+            db_connections (int): Сколько соединений с БД открыть.
+            http_connections (int): Сколько соединений открыть с каждым сервисом.
+        """
+        logger.info("Warming up connections...")
+        warm_ups = [_probe_database() for _ in range(db_connections)]
+        for service_name in ServicesConfiguration.model_fields:
+            warm_ups.extend(_warm_up_service(service_name) for _ in range(http_connections))
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(warm_up, timeout=self.timeout) for warm_up in warm_ups),
+            return_exceptions=True,
+        )
+        failed = sum(isinstance(result, BaseException) for result in results)
+        if failed:
+            logger.warning(f"Warm-up finished with {failed} failed connections.")
+
+        await self.refresh()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Возвращает последний результат проверок.
+
+        Returns:
+            dict[str, Any]: Общая готовность и результаты проверок по зависимостям.
+        """
+        ready = len(self._results) == len(self._probes) and all(
+            result["ready"] for result in self._results.values()
+        )
+        return {"ready": ready, "dependencies": dict(self._results)}
+
+    def start(self) -> None:
+        """Запускает фоновое обновление проверок."""
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """Останавливает фоновое обновление проверок и закрывает клиенты проверок."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+
+            self._refresher = None
+
+        for client in _probe_clients.values():
+            await client.aclose()
+        _probe_clients.clear()
+
+
+readiness = ReadinessProbe(configs.readiness.INTERVAL, configs.readiness.TIMEOUT)
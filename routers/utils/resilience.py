@@ -0,0 +1,193 @@
+import asyncio
+import random
+import time
+from enum import Enum
+
+from httpx import (
+    AsyncBaseTransport,
+    ConnectError,
+    ConnectTimeout,
+    Request,
+    Response,
+    TransportError,
+)
+
+from service_logging import logger
+
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+
+
+class BreakerState(Enum):
+    """Перечисление состояний предохранителя."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectError):
+    """Запрос не отправлен, так как предохранитель сервиса разомкнут."""
+
+
+class CircuitBreaker:
+    """Предохранитель обращений к связанному сервису.
+
+    После `failure_threshold` ошибок подряд размыкается и в течение
+    `recovery_timeout` секунд отклоняет запросы, не обращаясь к сервису.
+    Затем пропускает один пробный запрос: успех замыкает предохранитель,
+    ошибка снова размыкает. Если до пробного запроса осталось не больше
+    `max_wait` секунд, запрос дожидается его вместо немедленного отказа.
+    """
+
+    def __init__(
+        self, service_name: str, failure_threshold: int, recovery_timeout: float, max_wait: float
+    ) -> None:
+        self.service_name = service_name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_wait = max_wait
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def _reject(self) -> None:
+        raise CircuitOpenError(f"Circuit breaker for {self.service_name} is {self.state.value}")
+
+    async def acquire(self) -> None:
+        """Разрешает отправку запроса или отклоняет его.
+
+        Raises:
+            CircuitOpenError: Предохранитель разомкнут.
+        """
+        if self.state == BreakerState.OPEN:
+            remaining = self.opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > self.max_wait:
+                self._reject()
+
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+            if self.state == BreakerState.OPEN:
+                logger.info(f"Circuit breaker for {self.service_name} is half-open.")
+                self.state = BreakerState.HALF_OPEN
+
+        if self.state == BreakerState.HALF_OPEN:
+            if self._probing:
+                self._reject()
+            self._probing = True
+
+    def release(self) -> None:
+        """Освобождает пробный запрос, завершившийся без результата."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Учитывает успешный запрос и замыкает предохранитель."""
+        if self.state != BreakerState.CLOSED:
+            logger.info(f"Circuit breaker for {self.service_name} is closed.")
+
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Учитывает ошибку запроса, размыкая предохранитель при превышении порога."""
+        self.failures += 1
+        self._probing = False
+
+        if self.state == BreakerState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != BreakerState.OPEN:
+                logger.warning(f"Circuit breaker for {self.service_name} is open.")
+            self.state = BreakerState.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        """Возвращает текущее состояние предохранителя.
+
+        Returns:
+            dict: Состояние и количество ошибок подряд.
+        """
+        return {"state": self.state.value, "failures": self.failures}
+
+
+class ResilientTransport(AsyncBaseTransport):
+    """Транспорт httpx с предохранителем и повторными попытками.
+
+    Повторяет запросы при ошибках подключения и ответах 502/503/504
+    с экспоненциальной задержкой и полным джиттером. Остальные ответы
+    возвращаются как есть.
+
+    Запросы с расширением `{"breaker": False}` отправляются напрямую, без
+    повторов и без учета в предохранителе.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        breaker: CircuitBreaker,
+        retries: int,
+        backoff: float,
+        max_backoff: float,
+    ) -> None:
+        self.transport = transport
+        self.breaker = breaker
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    async def _send(self, request: Request) -> Response:
+        await self.breaker.acquire()
+        try:
+            response = await self.transport.handle_async_request(request)
+
+        except TransportError:
+            self.breaker.record_failure()
+            raise
+
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        return response
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if not request.extensions.get("breaker", True):
+            return await self.transport.handle_async_request(request)
+
+        # * Потоковое тело запроса нельзя отправить повторно
+        if not request.extensions.get("retryable", True):
+            return await self._send(request)
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(request)
+
+            except CircuitOpenError:
+                raise
+
+            except (ConnectError, ConnectTimeout):
+                if attempt >= self.retries:
+                    raise
+
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.retries:
+                    return response
+
+                await response.aclose()
+
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+            attempt += 1
+            logger.warning(
+                f"Retrying request to {self.breaker.service_name} in {delay:.2f}s "
+                f"(attempt {attempt + 1}/{self.retries + 1})..."
+            )
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
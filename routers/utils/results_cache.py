@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import configs
+from database.models import CachedResult, Task
+from service_metrics import results_cache_lookups
+
+from .cache import LRUCache
+
+
+class ResultsCache:
+    """Кеш результатов оценки, адресуемый хешем аудиофайла и идентификатором текста.
+
+    Первый уровень - LRU кеш в памяти процесса, второй - таблица
+    `results_cache`, общая для всех узлов.
+    """
+
+    def __init__(self, max_size: int, ttl: float, storage_ttl: float) -> None:
+        self.storage_ttl = storage_ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory = LRUCache(max_size, ttl)
+
+    async def lookup(
+        self, db: AsyncSession, audio_hash: str, text_id: UUID
+    ) -> dict[str, Any] | None:
+        """Ищет сохраненный результат оценки аудиофайла.
+
+        Args:
+            db (AsyncSession): Обьект сессии базы данных.
+            audio_hash (str): SHA-256 хеш аудиофайла.
+            text_id (UUID): Идентификатор текста.
+
+        Returns:
+            dict[str, Any] | None: Транскрипция, точность и ошибки произношения.
+        """
+        key = (audio_hash, text_id)
+        cached = self._memory.get(key)
+
+        if cached is None:
+            expired_at = datetime.now(timezone.utc) - timedelta(seconds=self.storage_ttl)
+            stmt = select(CachedResult.result, CachedResult.accuracy, CachedResult.mistakes).where(
+                (CachedResult.audio_hash == audio_hash)
+                & (CachedResult.text_id == text_id)
+                & (CachedResult.created_at > expired_at)
+            )
+            row = await db.execute(stmt)
+            row = row.one_or_none()
+
+            if row is not None:
+                cached = row._asdict()
+                self._memory.set(key, cached)
+
+        if cached is None:
+            self.misses += 1
+            results_cache_lookups.inc(outcome="miss")
+        else:
+            self.hits += 1
+            results_cache_lookups.inc(outcome="hit")
+
+        return cached
+
+    async def store(self, db: AsyncSession, task_obj: Task) -> None:
+        """Сохраняет результат завершенной задачи в рамках текущей транзакции.
+
+        Args:
+            db (AsyncSession): Обьект сессии базы данных.
+            task_obj (Task): Обьект ORM завершенной задачи.
+        """
+        if task_obj.audio_hash is None:
+            return
+
+        cached = {
+            "result": task_obj.result,
+            "accuracy": task_obj.accuracy,
+            "mistakes": task_obj.mistakes,
+        }
+        stmt = insert(CachedResult).values(
+            audio_hash=task_obj.audio_hash,
+            text_id=task_obj.text_id,
+            created_at=datetime.now(timezone.utc),
+            **cached,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CachedResult.audio_hash, CachedResult.text_id],
+            set_={**cached, "created_at": stmt.excluded.created_at},
+        )
+        await db.execute(stmt)
+        self._memory.set((task_obj.audio_hash, task_obj.text_id), cached)
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает счетчики попаданий и промахов кеша.
+
+        Returns:
+            dict[str, int]: Счетчики кеша.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._memory)}
+
+
+results_cache = ResultsCache(
+    configs.cache.MAX_SIZE,
+    configs.cache.TTL,
+    configs.cache.STORAGE_TTL,
+)
@@ -0,0 +1,35 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from schemas.tasks import TaskListItem, TaskListPage
+
+tasks_page_adapter = TypeAdapter(TaskListPage)
+
+
+class JSONBytesResponse(Response):
+    """Ответ с телом, уже сериализованным в JSON.
+    Тело передается клиенту как есть, без повторной проверки и кодирования.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content
+
+
+def dump_tasks_page(items: list[TaskListItem], next_cursor: str | None) -> bytes:
+    """Сериализует страницу списка задач напрямую из строк выборки.
+
+    Элементы не проверяются повторно: они строятся из проекции запроса,
+    типы которой совпадают с `TasksResponse`.
+
+    Args:
+        items (list[TaskListItem]): Элементы страницы.
+        next_cursor (str | None): Курсор следующей страницы.
+
+    Returns:
+        bytes: Тело ответа в JSON.
+    """
+    return tasks_page_adapter.dump_json({"items": items, "next_cursor": next_cursor})
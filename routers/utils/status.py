@@ -0,0 +1,19 @@
+from database.models import Task
+from database.notifications import task_events
+from database.types import Status
+
+
+async def update_status(task_obj: Task, status: Status) -> None:
+    """Функция меняет промежуточный статус задачи, уведомляя
+    подписчиков канала событий задач.
+
+    Промежуточные статусы в БД не записываются: их хранят в памяти
+    процессы, получившие событие. В БД фиксируются только создание
+    задачи, её захват обработчиком и итоговый результат.
+
+    Args:
+        task_obj (Task): Обьект ORM задачи.
+        status (Status): Новый статус задачи.
+    """
+    task_obj.status = status
+    await task_events.notify(task_obj)
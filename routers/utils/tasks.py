@@ -1,45 +1,243 @@
 import asyncio
+import json
 from datetime import datetime, timezone
-from io import BytesIO
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator, Iterable
+from uuid import UUID, uuid4
 
-from fastapi import Request
+from fastapi import Request, UploadFile
+from sqlalchemy import ColumnElement, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from configs import configs
+from database import LocalAsyncSession
 from database.models import Task
-from database.types import Status
-from service_logging import logger
+from database.notifications import TERMINAL_STATUSES, notify_status, task_events
+from database.types import Checkpoint, Priority, Status
+from service_logging import hot_logger, logger
+from service_metrics import pipeline_stage_duration, sse_streams_open, tasks_finished
+from storage import PREPROCESSED_BLOB, UPLOAD_BLOB, blobs
 
 from .evaluating import evaluate_transcription
-from .preprocessing import preprocess_audio
-from .transcribing import transcribe_audio
+from .preprocessing import preprocess_audio, stream_preprocessed_audio
+from .results_cache import results_cache
+from .transcribing import transcribe_audio, transcribe_audio_stream
+from .uploads import open_upload, validate_upload
 
 
-async def start_task(audio_file: BytesIO, task_obj: Task, db: AsyncSession):
+async def prepare_task(
+    file: UploadFile,
+    title: str,
+    user_id: UUID,
+    text_id: UUID,
+    db: AsyncSession,
+    task_id: UUID | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> dict[str, Any]:
+    """Сохраняет загруженный аудиофайл в хранилище блобов и формирует
+    значения колонок новой задачи.
+
+    Если результат оценки этого аудиофайла для того же текста уже есть
+    в кеше, задача формируется сразу завершенной и в очередь не попадает.
+
+    Args:
+        file (UploadFile): Загруженный аудиофайл.
+        title (str): Название упражнения.
+        user_id (UUID): Идентификатор пользователя.
+        text_id (UUID): Идентификатор текста.
+        db (AsyncSession): Обьект сессии базы данных.
+        task_id (UUID | None, optional): Заранее выбранный идентификатор задачи.
+            Defaults to None.
+        priority (Priority, optional): Полоса приоритета обработки.
+            Defaults to Priority.INTERACTIVE.
+
+    Returns:
+        dict[str, Any]: Значения колонок задачи.
+    """
+    values = {
+        "id": task_id or uuid4(),
+        "title": title,
+        "user_id": user_id,
+        "text_id": text_id,
+        "status": Status.CREATED,
+        "priority": priority,
+        "result": None,
+        "accuracy": None,
+        "mistakes": None,
+        "created_at": datetime.now(tz=timezone.utc),
+        "completed_at": None,
+    }
+
+    upload_metadata = await validate_upload(file)
+
+    # * Аудиофайл сохраняется до фиксации задачи, чтобы обработчик не забрал её раньше
+    values["audio_hash"] = await blobs.save(values["id"], UPLOAD_BLOB, file.file)
+    if any(upload_metadata.values()):
+        await blobs.save_metadata(values["id"], UPLOAD_BLOB, upload_metadata)
+
+    cached = None
+    if configs.cache.ENABLE:
+        cached = await results_cache.lookup(db, values["audio_hash"], text_id)
+
+    if cached:
+        logger.info("Pronunciation assessment found in cache.")
+        await blobs.delete(values["id"])
+        values.update(cached)
+        values["status"] = Status.COMPLETED
+        values["completed_at"] = datetime.now(tz=timezone.utc)
+
+    return values
+
+
+class LeaseLostError(RuntimeError):
+    """Задача передана другому обработчику после истечения аренды."""
+
+
+def _owned(task_obj: Task) -> ColumnElement[bool]:
+    # * Номер попытки меняется при каждом захвате, поэтому отсекает записи устаревшего запуска.
+    # * Время создания ограничивает поиск одним разделом таблицы
+    return (
+        (Task.id == task_obj.id)
+        & (Task.created_at == task_obj.created_at)
+        & (Task.attempts == task_obj.attempts)
+    )
+
+
+async def _persist_result(task_obj: Task) -> bool:
+    async with LocalAsyncSession() as db:
+        stmt = (
+            update(Task)
+            .where(_owned(task_obj))
+            .values(
+                status=task_obj.status,
+                result=task_obj.result,
+                accuracy=task_obj.accuracy,
+                mistakes=task_obj.mistakes,
+                comment=task_obj.comment,
+                completed_at=task_obj.completed_at,
+                lease_expires_at=None,
+            )
+        )
+        persisted = await db.execute(stmt)
+        if not persisted.rowcount:
+            await db.rollback()
+            logger.warning("Task was taken over by another worker. Result dropped.")
+            return False
+
+        if configs.cache.ENABLE and task_obj.status == Status.COMPLETED:
+            await results_cache.store(db, task_obj)
+
+        await notify_status(db, task_obj)
+        await db.commit()
+
+    return True
+
+
+async def _save_checkpoint(task_obj: Task, checkpoint: Checkpoint) -> None:
+    task_obj.checkpoint = checkpoint
+    async with LocalAsyncSession() as db:
+        stmt = (
+            update(Task)
+            .where(_owned(task_obj))
+            .values(checkpoint=checkpoint, result=task_obj.result)
+        )
+        saved = await db.execute(stmt)
+        if not saved.rowcount:
+            raise LeaseLostError("Task was taken over by another worker.")
+
+        await db.commit()
+
+
+async def _checkpointed(chunks: AsyncIterator[bytes], task_obj: Task) -> AsyncIterator[bytes]:
+    # * Части пишутся сразу в блоб, контрольная точка сохраняется, когда предобработка завершена
+    with blobs.create(task_obj.id, PREPROCESSED_BLOB) as preprocessed_audio_file:
+        async for chunk in chunks:
+            await asyncio.to_thread(preprocessed_audio_file.write, chunk)
+            yield chunk
+
+    await _save_checkpoint(task_obj, Checkpoint.PREPROCESSED)
+
+
+async def _transcribe(task_obj: Task) -> str:
+    if task_obj.checkpoint == Checkpoint.TRANSCRIBED:
+        logger.info("Resuming from the transcription checkpoint...")
+        return task_obj.result
+
+    preprocessed_path = blobs.path(task_obj.id, PREPROCESSED_BLOB)
+    if task_obj.checkpoint == Checkpoint.PREPROCESSED and preprocessed_path.exists():
+        logger.info("Resuming from the preprocessing checkpoint...")
+        with (
+            pipeline_stage_duration.time(stage="transcribing"),
+            blobs.open(task_obj.id, PREPROCESSED_BLOB) as preprocessed_audio_file,
+        ):
+            return await transcribe_audio(preprocessed_audio_file, task_obj)
+
+    if configs.worker.STREAMING_PIPELINE and not configs.batching.ENABLE:
+        with pipeline_stage_duration.time(stage="streaming"):
+            async with open_upload(task_obj.id) as upload:
+                async with stream_preprocessed_audio(upload, task_obj) as chunks:
+                    if configs.worker.CHECKPOINTS:
+                        chunks = _checkpointed(chunks, task_obj)
+                    return await transcribe_audio_stream(chunks, task_obj)
+
+    with pipeline_stage_duration.time(stage="preprocessing"):
+        async with open_upload(task_obj.id) as upload:
+            preprocessed_audio_file = await preprocess_audio(upload, task_obj)
+
+    if configs.worker.CHECKPOINTS:
+        await blobs.save(task_obj.id, PREPROCESSED_BLOB, preprocessed_audio_file)
+        await _save_checkpoint(task_obj, Checkpoint.PREPROCESSED)
+
+    with pipeline_stage_duration.time(stage="transcribing"), preprocessed_audio_file:
+        return await transcribe_audio(preprocessed_audio_file, task_obj)
+
+
+async def start_task(task_obj: Task) -> None:
     """Запускает в работу задачу на обработку аудиофайла, возвращая извлеченную
     из него фонетическую запись прочитанного текста. Функция также управляет
     статусом задачи.
 
+    Исходный аудиофайл читается потоком из хранилища блобов, куда он был
+    сохранен при создании задачи, и удаляется после ее завершения.
+
+    В потоковом режиме (`MANAGER_WORKER_STREAMING_PIPELINE`) ответ сервиса
+    предобработки передается сервису транскрибирования по мере получения.
+
+    Пока выполняются этапы, соединение с БД не удерживается: промежуточные
+    статусы только рассылаются через канал событий, а итоговый результат
+    записывается одним запросом в короткой сессии.
+
+    Если включены контрольные точки (`MANAGER_WORKER_CHECKPOINTS`), после
+    предобработки ее результат сохраняется в хранилище блобов, а после
+    транскрибирования транскрипция записывается в задачу. Задача,
+    восстановленная после аварийного завершения обработчика, продолжается
+    с последнего сохраненного этапа. Задача, прерывавшаяся больше
+    `MANAGER_WORKER_MAX_ATTEMPTS` раз, завершается ошибкой.
+
+    Контрольные точки и результат записываются только для попытки, под
+    которой задача была захвачена. Если аренда истекла и задачу забрал
+    другой обработчик, текущий запуск прерывается, а его результат
+    отбрасывается.
+
     Args:
-        audio_file (BytesIO): Поток байтов аудиофайала.
-        task_obj (Task): Обьект ORM задачи.
-        db (AsyncSession): Обьект сессии базы данных.
+        task_obj (Task): Обьект ORM задачи, захваченной из очереди.
     """
     try:
+        if task_obj.attempts > configs.worker.MAX_ATTEMPTS:
+            raise RuntimeError(f"Pipeline interrupted {task_obj.attempts - 1} times.")
+
         logger.info("Starting pronunciation assessment pipeline...")
-        db.add(task_obj)
-        task_obj.status = Status.STARTED
-        await db.commit()
+        text_transcription = await _transcribe(task_obj)
+        if configs.worker.CHECKPOINTS and task_obj.checkpoint != Checkpoint.TRANSCRIBED:
+            task_obj.result = text_transcription
+            await _save_checkpoint(task_obj, Checkpoint.TRANSCRIBED)
 
-        preprocessed_audio_file = await preprocess_audio(audio_file, task_obj, db)
-        text_transcription = await transcribe_audio(preprocessed_audio_file, task_obj, db)
-        feedback = await evaluate_transcription(text_transcription, task_obj, db)
+        with pipeline_stage_duration.time(stage="evaluating"):
+            feedback = await evaluate_transcription(text_transcription, task_obj)
 
         task_obj.status = Status.COMPLETED
         task_obj.result = text_transcription
         task_obj.accuracy = feedback.get("accuracy", 0.0)
         task_obj.mistakes = feedback.get("mistakes")
-        await db.commit()
 
         logger.success(f"Pronunciation assessed. Accuracy {task_obj.accuracy}.")
 
@@ -54,50 +252,167 @@ async def start_task(audio_file: BytesIO, task_obj: Task, db: AsyncSession):
 
     finally:
         task_obj.completed_at = datetime.now(tz=timezone.utc)
-        await db.commit()
+        if await _persist_result(task_obj):
+            await blobs.delete(task_obj.id)
+            tasks_finished.inc(status=task_obj.status.value)
+
+
+def current_status(task_id: UUID, stored_status: Status) -> Status:
+    """Возвращает актуальный статус задачи с учетом промежуточных статусов,
+    известных процессу из канала событий.
+
+    Args:
+        task_id (UUID): Идентификатор задачи.
+        stored_status (Status): Статус задачи, записанный в БД.
+
+    Returns:
+        Status: Актуальный статус задачи.
+    """
+    if stored_status in (Status.COMPLETED, Status.FAILED):
+        return stored_status
+
+    return task_events.status(task_id) or stored_status
+
+
+async def _fetch_status(task_id: UUID, created_at: datetime) -> Status:
+    async with LocalAsyncSession() as db:
+        stmt = select(Task.status).where((Task.id == task_id) & (Task.created_at == created_at))
+        task_status = await db.execute(stmt)
+        task_status = task_status.scalar_one_or_none()
+
+    if task_status is None:
+        return Status.UNKNOWN
+
+    return current_status(task_id, task_status)
+
+
+def _status_event(task_id: UUID, task_status: Status, on_update: bool = True) -> dict[str, Any]:
+    event_data = {
+        "event": "status_updated" if on_update else "status_checked",
+        "task_id": str(task_id),
+        "status": task_status.value,
+        "retry": 15000,
+    }
+    return {"data": json.dumps(event_data), "retry": 15000}
+
+
+async def _fetch_active_statuses(user_id: UUID, tracked: Iterable[UUID]) -> dict[UUID, Status]:
+    async with LocalAsyncSession() as db:
+        stmt = select(Task.id, Task.status).where(
+            (Task.user_id == user_id)
+            & (Task.status.not_in(TERMINAL_STATUSES) | Task.id.in_(tuple(tracked)))
+        )
+        statuses = await db.execute(stmt)
+        statuses = statuses.all()
+
+    return {task_id: current_status(task_id, task_status) for task_id, task_status in statuses}
+
+
+async def stream_user_tasks(user_id: UUID, req: Request) -> AsyncGenerator[dict[str, Any], None]:
+    """Функция создает обьект-генератор, стримящий состояние всех
+    незавершенных задач пользователя через одно соединение.
+
+    События приходят из канала событий задач с подпиской на пользователя,
+    поэтому задачи, созданные во время стрима, попадают в него сами.
+    Если событий нет дольше `MANAGER_EVENTS_FALLBACK_INTERVAL` секунд,
+    статусы перечитываются из БД короткой сессией. Стрим завершается,
+    когда незавершенных задач не остается.
+
+    Args:
+        user_id (UUID): Идентификатор пользователя.
+        req (Request): Обьект запроса на сервер.
+
+    Yields:
+        AsyncGenerator[dict[str, Any], None]: Генератор событий состояния задач.
+    """
+    pending: dict[UUID, Status] = {}
+    events = task_events.subscribe_user(user_id)
+
+    hot_logger.info("Starting user SSE stream...")
+    sse_streams_open.inc()
+    try:
+        # * Статусы читаются после подписки, чтобы не пропустить создание задачи
+        updates = await _fetch_active_statuses(user_id, ())
+        while True:
+            for task_id, task_status in updates.items():
+                if pending.get(task_id) == task_status:
+                    continue
+
+                yield _status_event(task_id, task_status)
+                if task_status in TERMINAL_STATUSES:
+                    pending.pop(task_id, None)
+                else:
+                    pending[task_id] = task_status
+
+            if not pending or await req.is_disconnected():
+                break
+
+            try:
+                event = await asyncio.wait_for(
+                    events.get(), timeout=configs.events.FALLBACK_INTERVAL
+                )
+                updates = {UUID(event["id"]): Status(event["status"])}
+
+            except asyncio.TimeoutError:
+                updates = await _fetch_active_statuses(user_id, pending)
+
+    finally:
+        task_events.unsubscribe_user(user_id, events)
+        sse_streams_open.dec()
+
+    hot_logger.info("User SSE stream closed.")
 
 
 async def stream_task(
-    task_obj: Task, db: AsyncSession, req: Request, on_update: bool = True
-) -> AsyncGenerator[str, None]:
+    task_obj: Task, req: Request, on_update: bool = True
+) -> AsyncGenerator[dict[str, Any], None]:
     """Функция создает обьект-генератор, позволяющий стримить состояние
     выполнения задачи в реальном времени.
 
+    Обновления статуса приходят из канала событий задач. Если событий нет
+    дольше `MANAGER_EVENTS_FALLBACK_INTERVAL` секунд, статус перечитывается
+    из БД короткой сессией, поэтому стрим не удерживает соединение из пула.
+
     Args:
         task_obj (Task): Обьект ORM задачи.
-        db (AsyncSession): Обьект сессии базы данных.
         req (Request): Обьект запроса на сервер.
         on_update (bool, optional): Отправлять данные только при обновлении.
             Defaults to True.
 
     Yields:
-        AsyncGenerator[str, None]: Генератор строки состояния задачи.
+        AsyncGenerator[dict[str, Any], None]: Генератор событий состояния задачи.
     """
     last_status = Status.UNKNOWN
-    db.add(task_obj)
-
-    logger.info("Starting SSE stream...")
-    while True:
-        if await req.is_disconnected():
-            break
-
-        current_status = task_obj.status
-
-        if current_status != last_status or not on_update:
-            logger.info(f"Sending update: {last_status} -> {current_status}")
-            last_status = current_status
-            event_data = {
-                "event": "status_updated" if on_update else "status_checked",
-                "task_id": str(task_obj.id),
-                "status": current_status.value,
-                "retry": 15000,
-            }
-            yield str(event_data)
-
-            if current_status in (Status.COMPLETED, Status.FAILED):
+    events = task_events.subscribe(task_obj.id)
+
+    hot_logger.info("Starting SSE stream...")
+    sse_streams_open.inc()
+    try:
+        # * Статус перечитывается после подписки, чтобы не пропустить промежуточное событие
+        current_status = await _fetch_status(task_obj.id, task_obj.created_at)
+        while True:
+            if await req.is_disconnected():
                 break
 
-        await db.refresh(task_obj)
-        await asyncio.sleep(1)
+            if current_status != last_status or not on_update:
+                hot_logger.info(f"Sending update: {last_status} -> {current_status}")
+                last_status = current_status
+                yield _status_event(task_obj.id, current_status, on_update)
+
+                if current_status in (Status.COMPLETED, Status.FAILED):
+                    break
+
+            try:
+                event = await asyncio.wait_for(
+                    events.get(), timeout=configs.events.FALLBACK_INTERVAL
+                )
+                current_status = Status(event["status"])
+
+            except asyncio.TimeoutError:
+                current_status = await _fetch_status(task_obj.id, task_obj.created_at)
+
+    finally:
+        task_events.unsubscribe(task_obj.id, events)
+        sse_streams_open.dec()
 
-    logger.info("SSE stream closed.")
+    hot_logger.info("SSE stream closed.")
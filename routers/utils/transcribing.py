@@ -1,41 +1,124 @@
-from io import BytesIO
-
-
-from sqlalchemy.ext.asyncio import AsyncSession
+import secrets
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, BinaryIO
 
 from configs import configs
 from database.models import Task
 from database.types import Status
 
+from .batching import transcription_batcher
 from .http_proxy import proxy_request
+from .status import update_status
 from service_logging import logger
 
+# * Ответы сервиса, не принимающего тело запроса без Content-Length
+CHUNKED_REJECTED_STATUS_CODES = (411, 501)
+
+_chunked_supported = True
 
-async def transcribe_audio(audio_file: BytesIO, task_obj: Task, db: AsyncSession) -> str:
+
+async def _transcribe_buffered(audio_file: BinaryIO) -> str:
+    async with proxy_request("transcribing") as client:
+        audio_file.seek(0)
+        response = await client.post(
+            "/",
+            data={"lang": "english"},
+            files={"file": ("audio.wav", audio_file, "audio/wav")},
+        )
+        response.raise_for_status()
+
+        return response.json()["transcription"]
+
+
+async def transcribe_audio(audio_file: BinaryIO, task_obj: Task) -> str:
     """Функция передает поток байтов аудиофайла на сервис транскрибирования,
     параллельно меняя статус задачи.
 
     Функция при помощи сервиса транскрибирования возвращает строку,
     которая является фонетической записью прочитанного текста.
 
+    Если включена пакетная обработка (`MANAGER_BATCHING_ENABLE`), аудиофайл
+    отправляется в составе пакета вместе с файлами других задач.
+
     Args:
-        audio_file (BytesIO): Поток байтов аудиофайала.
+        audio_file (BinaryIO): Поток байтов аудиофайала.
         task_obj (Task): Обьект ORM задачи.
-        db (AsyncSession): Обьект сессии базы данных.
 
     Returns:
         str: Фонетическая запись текста.
     """
-    task_obj.status = Status.TRANSCRIBING
-    await db.commit()
+    await update_status(task_obj, Status.TRANSCRIBING)
+
+    if configs.batching.ENABLE:
+        return await transcription_batcher.transcribe(audio_file)
 
     logger.info("Transcribing audio file....")
-    async with proxy_request(configs.services.transcribing.URL) as client:
-        response = await client.post(
-            "/",
-            data={"lang": "english"},
-            files={"file": ("audio.wav", audio_file.getvalue(), "audio/wav")},
-        )
-        response.raise_for_status()
+    return await _transcribe_buffered(audio_file)
 
-        return response.json()["transcription"]
+
+async def _multipart_body(boundary: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="lang"\r\n\r\n'
+        "english\r\n"
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="audio.wav"\r\n'
+        "Content-Type: audio/wav\r\n\r\n"
+    ).encode()
+
+    async for chunk in chunks:
+        yield chunk
+
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+async def transcribe_audio_stream(chunks: AsyncIterator[bytes], task_obj: Task) -> str:
+    """Функция передает аудиофайл на сервис транскрибирования по мере
+    получения его частей, параллельно меняя статус задачи.
+
+    Части отправляются телом запроса с `Transfer-Encoding: chunked`, поэтому
+    передача начинается до получения всего файла. Полученные части также
+    пишутся во временный файл: если сервис не принимает такое тело запроса,
+    оставшиеся части дочитываются и файл отправляется целиком. После первого
+    отказа процесс отправляет файлы сервису только целиком.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Итератор частей аудиофайла.
+        task_obj (Task): Обьект ORM задачи.
+
+    Returns:
+        str: Фонетическая запись текста.
+    """
+    global _chunked_supported
+
+    await update_status(task_obj, Status.TRANSCRIBING)
+
+    with SpooledTemporaryFile(max_size=configs.storage.SPOOL_MAX_SIZE) as audio_file:
+
+        async def forward() -> AsyncIterator[bytes]:
+            async for chunk in chunks:
+                audio_file.write(chunk)
+                yield chunk
+
+        if _chunked_supported:
+            logger.info("Transcribing audio stream....")
+            boundary = secrets.token_hex(16)
+            async with proxy_request("transcribing") as client:
+                response = await client.post(
+                    "/",
+                    content=_multipart_body(boundary, forward()),
+                    headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                    extensions={"retryable": False},
+                )
+                if response.status_code not in CHUNKED_REJECTED_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()["transcription"]
+
+            logger.warning("Chunked request bodies are rejected, falling back to buffered mode.")
+            _chunked_supported = False
+
+        async for chunk in chunks:
+            audio_file.write(chunk)
+
+        logger.info("Transcribing audio file....")
+        return await _transcribe_buffered(audio_file)
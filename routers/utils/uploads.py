@@ -0,0 +1,181 @@
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import PurePath
+from tempfile import SpooledTemporaryFile
+from typing import Any, AsyncIterator, BinaryIO
+from uuid import UUID
+
+from fastapi import HTTPException, UploadFile, status
+
+from configs import configs
+from service_logging import logger
+from storage import UPLOAD_BLOB, blobs
+
+from .compression import (
+    SUPPORTED_ENCODINGS,
+    DecompressedSizeExceeded,
+    iter_decompressed,
+    read_chunks,
+)
+
+# * Сжатые аудиоконтейнеры передаются сервису предобработки как есть
+CONTAINER_EXTENSIONS = {
+    "audio/aac": ".aac",
+    "audio/flac": ".flac",
+    "audio/mp4": ".m4a",
+    "audio/mpeg": ".mp3",
+    "audio/ogg": ".ogg",
+    "audio/opus": ".opus",
+    "audio/webm": ".webm",
+}
+ENCODING_CONTENT_TYPES = {
+    "application/gzip": "gzip",
+    "application/x-gzip": "gzip",
+    "application/zstd": "zstd",
+}
+ENCODING_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def detect_upload_format(file: UploadFile) -> dict[str, str | None]:
+    """Определяет кодирование и формат контейнера загруженного аудиофайла
+    по типу содержимого, расширению имени и заголовку `Content-Encoding` части.
+
+    Args:
+        file (UploadFile): Загруженный аудиофайл.
+
+    Returns:
+        dict[str, str | None]: Кодирование и тип аудиоконтейнера.
+    """
+    content_type = (file.content_type or "").split(";")[0].strip().lower()
+    suffix = PurePath(file.filename or "").suffix.lower()
+    suffix_encodings = {extension: encoding for encoding, extension in ENCODING_EXTENSIONS.items()}
+
+    encoding = (
+        ENCODING_CONTENT_TYPES.get(content_type)
+        or suffix_encodings.get(suffix)
+        or (file.headers.get("content-encoding") or "").strip().lower()
+        or None
+    )
+    if encoding == "identity":
+        encoding = None
+
+    return {
+        "encoding": encoding,
+        "content_type": content_type if content_type in CONTAINER_EXTENSIONS else None,
+    }
+
+
+def _measure_decompressed(source: BinaryIO, encoding: str) -> int:
+    chunks = iter_decompressed(
+        read_chunks(source, configs.storage.CHUNK_SIZE),
+        encoding,
+        configs.storage.MAX_DECOMPRESSED_SIZE,
+        configs.storage.CHUNK_SIZE,
+    )
+    return sum(len(chunk) for chunk in chunks)
+
+
+async def validate_upload(file: UploadFile) -> dict[str, Any]:
+    """Проверяет размер и кодирование загруженного аудиофайла.
+
+    Сжатый файл распаковывается потоком только для подсчета размера,
+    распакованные данные не сохраняются.
+
+    Args:
+        file (UploadFile): Загруженный аудиофайл.
+
+    Raises:
+        HTTPException: 413. Файл или распакованные данные превышают лимит.
+        HTTPException: 415. Кодирование файла не поддерживается.
+        HTTPException: 400. Сжатые данные повреждены.
+
+    Returns:
+        dict[str, Any]: Метаданные загрузки для сохранения рядом с блобом.
+    """
+    metadata = detect_upload_format(file)
+
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, 2)
+
+    if size > configs.storage.MAX_UPLOAD_SIZE:
+        detail = f"Upload exceeds {configs.storage.MAX_UPLOAD_SIZE} bytes."
+        logger.error(detail)
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+    encoding = metadata["encoding"]
+    if encoding is None:
+        return metadata
+
+    if encoding not in SUPPORTED_ENCODINGS:
+        detail = f"Unsupported upload encoding: {encoding}."
+        logger.error(detail)
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=detail)
+
+    try:
+        await asyncio.to_thread(_measure_decompressed, file.file, encoding)
+
+    except DecompressedSizeExceeded as error:
+        logger.error(str(error))
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(error))
+
+    except Exception as error:
+        detail = "Malformed compressed upload."
+        logger.error(f"{detail} {error}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+    return metadata
+
+
+def _decompress_to_spool(source: BinaryIO, encoding: str) -> BinaryIO:
+    target = SpooledTemporaryFile(max_size=configs.storage.SPOOL_MAX_SIZE)
+    chunks = iter_decompressed(
+        read_chunks(source, configs.storage.CHUNK_SIZE),
+        encoding,
+        configs.storage.MAX_DECOMPRESSED_SIZE,
+        configs.storage.CHUNK_SIZE,
+    )
+    for chunk in chunks:
+        target.write(chunk)
+
+    target.seek(0)
+    return target
+
+
+@asynccontextmanager
+async def open_upload(task_id: UUID) -> AsyncIterator[tuple[str, BinaryIO, str]]:
+    """Асинхронный контекстный менеджер, открывающий исходный аудиофайл
+    задачи для отправки сервису предобработки.
+
+    Сжатый файл передается как есть, если сервис предобработки принимает
+    его кодирование (`MANAGER_SERVICE_PREPROCESSING_ACCEPT_ENCODINGS`).
+    Иначе он распаковывается во временный файл в отдельном потоке.
+
+    Args:
+        task_id (UUID): Идентификатор задачи.
+
+    Yields:
+        AsyncIterator[tuple[str, BinaryIO, str]]: Имя файла, файловый объект
+            и тип содержимого для части multipart запроса.
+    """
+    metadata = blobs.read_metadata(task_id, UPLOAD_BLOB)
+    encoding = metadata.get("encoding")
+    content_type = metadata.get("content_type")
+
+    filename = "audio" + CONTAINER_EXTENSIONS.get(content_type, ".pcm")
+    content_type = content_type or "application/octet-stream"
+
+    with blobs.open(task_id, UPLOAD_BLOB) as audio_file:
+        if encoding is None:
+            yield filename, audio_file, content_type
+
+        elif encoding in configs.services.preprocessing.ACCEPT_ENCODINGS:
+            encoded_type = next(
+                key for key, value in ENCODING_CONTENT_TYPES.items() if value == encoding
+            )
+            yield filename + ENCODING_EXTENSIONS[encoding], audio_file, encoded_type
+
+        else:
+            decompressed = await asyncio.to_thread(_decompress_to_spool, audio_file, encoding)
+            with decompressed:
+                yield filename, decompressed, content_type
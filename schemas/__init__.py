@@ -3,6 +3,7 @@ from .tasks import (
     CreateTaskResponse,
     DetailTaskRequest,
     DetailTaskResponse,
+    TasksPageResponse,
     TasksRequest,
     TasksResponse,
 )
@@ -12,6 +13,7 @@ __all__ = (
     "CreateTaskResponse",
     "DetailTaskRequest",
     "DetailTaskResponse",
+    "TasksPageResponse",
     "TasksRequest",
     "TasksResponse",
 )
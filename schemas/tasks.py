@@ -2,9 +2,9 @@ from datetime import datetime
 from typing import TypedDict
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from database.types import Status
+from database.types import Priority, Status
 
 from .examples import (
     ACCURACY_EXAMPLES,
@@ -16,6 +16,14 @@ from .examples import (
     STATUS_EXAMPLES,
 )
 
+# * Промежуточные статусы не записываются в БД, поэтому фильтровать по ним нельзя
+UNFILTERABLE_STATUSES = (
+    Status.PREPROCESSING,
+    Status.TRANSCRIBING,
+    Status.EVALUATING,
+    Status.UNKNOWN,
+)
+
 
 class PhoneticMistake(TypedDict):
     """Типизированный словарь для описания фонетической ошибки пользователя."""
@@ -25,6 +33,27 @@ class PhoneticMistake(TypedDict):
     type: str
 
 
+class TaskListItem(TypedDict):
+    """Типизированный словарь элемента списка задач для быстрой сериализации.
+    Повторяет поля `TasksResponse`.
+    """
+
+    id: UUID
+    status: Status
+    title: str
+    accuracy: float | None
+    created_at: datetime
+
+
+class TaskListPage(TypedDict):
+    """Типизированный словарь страницы списка задач для быстрой сериализации.
+    Повторяет поля `TasksPageResponse`.
+    """
+
+    items: list[TaskListItem]
+    next_cursor: str | None
+
+
 class BaseSchema(BaseModel):
     """Базовая схема данных."""
 
@@ -35,6 +64,30 @@ class TasksRequest(BaseSchema):
     """Данные, необходимые для получения задач."""
 
     user_id: UUID = Field(description="Идентификатор пользователя", examples=ID_EXAMPLES)
+    limit: int = Field(default=50, description="Размер страницы", ge=1, le=500)
+    cursor: str | None = Field(default=None, description="Курсор следующей страницы")
+    status: Status | None = Field(
+        default=None,
+        description="Фильтр по статусу. `started` выбирает все задачи в работе",
+        examples=STATUS_EXAMPLES,
+    )
+    created_from: datetime | None = Field(
+        default=None, description="Начало периода создания", examples=CREATED_AT_EXAMPLES
+    )
+    created_to: datetime | None = Field(
+        default=None, description="Конец периода создания", examples=CREATED_AT_EXAMPLES
+    )
+
+    @field_validator("status")
+    @classmethod
+    def check_status(cls, value: Status | None) -> Status | None:
+        """Отклоняет фильтр по статусу, который не записывается в БД."""
+        if value in UNFILTERABLE_STATUSES:
+            raise ValueError(
+                f"Filtering by '{value.value}' is not supported, "
+                "use 'started' for tasks in progress."
+            )
+        return value
 
 
 # *Не используется. Пришлось отказаться из-за особенностей загрузки файлов.
@@ -69,6 +122,13 @@ class TasksResponse(BaseSchema):
     created_at: datetime = Field(description="Время создания задачи", examples=CREATED_AT_EXAMPLES)
 
 
+class TasksPageResponse(BaseSchema):
+    """Страница списка задач пользователя."""
+
+    items: list[TasksResponse] = Field(description="Задачи страницы")
+    next_cursor: str | None = Field(description="Курсор следующей страницы")
+
+
 class DetailTaskResponse(BaseSchema):
     """Данные, отправляемые в ответ на получение информации
     по конкретной задаче.
@@ -78,6 +138,7 @@ class DetailTaskResponse(BaseSchema):
     title: str = Field(description="Название упраженения", max_length=50)
     text_id: UUID = Field(description="Идентификатор текста", examples=ID_EXAMPLES)
     status: Status = Field(description="Статуст выполнения", examples=STATUS_EXAMPLES)
+    priority: Priority = Field(description="Полоса приоритета обработки")
     result: str | None = Field(description="Результат транскрибирования", examples=RESULT_EXAMPLES)
     accuracy: float | None = Field(
         description="Точность произношения", ge=0, le=100, examples=ACCURACY_EXAMPLES
@@ -2,4 +2,7 @@ from .setup import setup_logger
 
 logger = setup_logger()
 
-__all__ = ("logger",)
+# * Логер для частых сообщений горячего пути, подлежащих сэмплированию
+hot_logger = logger.bind(sampled=True)
+
+__all__ = ("hot_logger", "logger")
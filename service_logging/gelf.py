@@ -0,0 +1,72 @@
+import logging
+import threading
+
+import graypy
+
+
+class BatchedGELFHandler(logging.Handler):
+    """Хендлер, отправляющий GELF сообщения в Graylog пакетами.
+
+    Записи упаковываются в GELF сразу, а отправляются при накоплении
+    `batch_size` сообщений или раз в `flush_interval` секунд из фонового
+    потока. По TCP пакет уходит одной записью в сокет, по UDP каждое
+    сообщение остается отдельной датаграммой.
+    """
+
+    def __init__(
+        self,
+        target: graypy.handler.BaseGELFHandler,
+        batch_size: int,
+        flush_interval: float,
+    ) -> None:
+        super().__init__()
+        self.target = target
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: list[bytes] = []
+        self._pending_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            packet = self.target.makePickle(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._pending_lock:
+            self._pending.append(packet)
+            full = len(self._pending) >= self.batch_size
+
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._pending_lock:
+            packets, self._pending = self._pending, []
+
+        if not packets:
+            return
+
+        try:
+            if isinstance(self.target, graypy.GELFTCPHandler):
+                self.target.send(b"".join(packets))
+            else:
+                for packet in packets:
+                    self.target.send(packet)
+
+        except Exception:
+            # * Недоступность Graylog не должна влиять на работу сервиса
+            pass
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stopped.set()
+        self.flush()
+        self.target.close()
+        super().close()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 import sys
 
 import graypy
@@ -8,6 +9,8 @@ from loguru import logger
 
 from configs import configs
 
+from .gelf import BatchedGELFHandler
+
 
 def loguru_formatter(record: loguru.Record) -> str:
     """Возвращает строку формата логирования для loguru.
@@ -36,38 +39,70 @@ def loguru_formatter(record: loguru.Record) -> str:
     )
 
 
+def sampling_filter(record: loguru.Record) -> bool:
+    """Фильтр, пропускающий только долю сообщений горячего пути.
+
+    Сэмплируются записи, привязанные к `sampled=True`, с уровнем ниже
+    WARNING. Предупреждения и ошибки пропускаются всегда.
+
+    Args:
+        record (loguru.Record): Объект записи лога loguru.
+
+    Returns:
+        bool: Записать ли сообщение.
+    """
+    if not record["extra"].get("sampled") or record["level"].no >= logger.level("WARNING").no:
+        return True
+
+    return random.random() < configs.logging.SAMPLE_RATE
+
+
+def create_gelf_handler() -> BatchedGELFHandler:
+    """Создает пакетный GELF хендлер по настройкам Graylog.
+
+    Returns:
+        BatchedGELFHandler: Хендлер для отправки логов в Graylog.
+    """
+    handler_class = graypy.GELFUDPHandler
+    if configs.graylog.PROTOCOL == "tcp":
+        handler_class = graypy.GELFTCPHandler
+
+    return BatchedGELFHandler(
+        handler_class(configs.graylog.HOST, configs.graylog.PORT),
+        configs.graylog.BATCH_SIZE,
+        configs.graylog.FLUSH_INTERVAL,
+    )
+
+
 def setup_logger() -> loguru.Logger:
     """Функция инициализации кастомного логера loguru.
 
-    В процессе инициализации устанавливается хендлер stdout,
-    с уровнем DEBUG и кастомным оформлением формата лога.
+    В процессе инициализации устанавливается хендлер stdout
+    с кастомным оформлением формата лога. Уровень задается
+    переменной LOGGING_LEVEL, по умолчанию DEBUG в режиме отладки
+    и INFO в остальных случаях. Запись в хендлеры выполняется
+    в отдельном потоке, не блокируя цикл событий, а захват
+    значений переменных в трассировках включен только в режиме отладки.
 
     Дополнительно, если в конфигурации проекта установлена
     переменная GRAYLOG_ENABLE, подключается GELF хендлер
-    для оправки логов в Graylog.
+    для пакетной оправки логов в Graylog.
     """
     logger.remove()
 
-    logger.add(
-        sink=sys.stdout,  # ?
-        format=loguru_formatter,
-        level="DEBUG",
-        colorize=True,
-        backtrace=True,
-        diagnose=True,
-    )
+    level = configs.logging.LEVEL or ("DEBUG" if configs.DEBUG_MODE else "INFO")
+    options = {
+        "format": loguru_formatter,
+        "level": level,
+        "filter": sampling_filter,
+        "enqueue": configs.logging.ENQUEUE,
+        "backtrace": configs.DEBUG_MODE,
+        "diagnose": configs.DEBUG_MODE,
+    }
+
+    logger.add(sink=sys.stdout, colorize=True, **options)
 
     if configs.graylog.ENABLE:
-        gelf_handler = graypy.GELFUDPHandler(
-            configs.graylog.HOST,
-            configs.graylog.PORT,
-        )
-        logger.add(
-            sink=gelf_handler,
-            format=loguru_formatter,
-            level="DEBUG",
-            backtrace=True,
-            diagnose=True,
-        )
+        logger.add(sink=create_gelf_handler(), **options)
 
     return logger.bind(service=configs.SERVICE_NAME)
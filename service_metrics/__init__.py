@@ -0,0 +1,102 @@
+from database import engine
+
+from .registry import Counter, Gauge, Histogram, Registry
+from .server import serve_metrics
+
+registry = Registry()
+
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route.",
+        ("method", "route", "status_code"),
+    )
+)
+pipeline_stage_duration = registry.register(
+    Histogram(
+        "pipeline_stage_duration_seconds",
+        "Pronunciation assessment pipeline stage latency.",
+        ("stage",),
+    )
+)
+downstream_request_duration = registry.register(
+    Histogram(
+        "downstream_request_duration_seconds",
+        "Downstream service HTTP call latency.",
+        ("service", "outcome"),
+    )
+)
+tasks_finished = registry.register(
+    Counter(
+        "tasks_finished_total",
+        "Finished tasks by final status.",
+        ("status",),
+    )
+)
+results_cache_lookups = registry.register(
+    Counter(
+        "results_cache_lookups_total",
+        "Results cache lookups by outcome.",
+        ("outcome",),
+    )
+)
+admission_rejections = registry.register(
+    Counter(
+        "admission_rejections_total",
+        "Task submissions rejected by admission control.",
+        ("reason",),
+    )
+)
+queue_wait_duration = registry.register(
+    Histogram(
+        "queue_wait_seconds",
+        "Time tasks spent queued before being claimed, by priority lane.",
+        ("priority",),
+        buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 600.0, 1800.0, 3600.0),
+    )
+)
+tasks_in_flight = registry.register(
+    Gauge(
+        "tasks_in_flight",
+        "Pipelines currently running in this process.",
+    )
+)
+sse_streams_open = registry.register(
+    Gauge(
+        "sse_streams_open",
+        "Open SSE status streams.",
+    )
+)
+db_pool_checked_out = registry.register(
+    Gauge(
+        "db_pool_checked_out",
+        "SQLAlchemy pool connections currently checked out.",
+        collect=lambda: engine.pool.checkedout(),
+    )
+)
+db_pool_overflow = registry.register(
+    Gauge(
+        "db_pool_overflow",
+        "SQLAlchemy pool overflow connections.",
+        collect=lambda: max(engine.pool.overflow(), 0),
+    )
+)
+
+__all__ = (
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "admission_rejections",
+    "db_pool_checked_out",
+    "db_pool_overflow",
+    "downstream_request_duration",
+    "http_request_duration",
+    "pipeline_stage_duration",
+    "queue_wait_duration",
+    "registry",
+    "results_cache_lookups",
+    "serve_metrics",
+    "sse_streams_open",
+    "tasks_finished",
+    "tasks_in_flight",
+)
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Callable
+
+from service_logging import logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def serve_metrics(render: Callable[[], str], port: int) -> asyncio.Server:
+    """Запускает минимальный HTTP сервер, отдающий метрики на любой GET запрос.
+    Используется процессами без HTTP API, например отдельным обработчиком очереди.
+
+    Args:
+        render (Callable[[], str]): Функция, возвращающая метрики в текстовом формате.
+        port (int): Порт сервера.
+
+    Returns:
+        asyncio.Server: Запущенный сервер.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = render().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                + f"Content-Type: {CONTENT_TYPE}\r\n".encode()
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host="0.0.0.0", port=port)
+    logger.info(f"Serving metrics on port {port}.")
+    return server
@@ -1,13 +1,108 @@
+import argparse
+import multiprocessing
+import os
+import signal
+from importlib.util import find_spec
+
 import uvicorn
 
 from configs import configs
 
-if __name__ == "__main__":
+ROLES = ("api", "worker", "all")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ILPS task manager launcher.")
+    parser.add_argument(
+        "--role",
+        choices=ROLES,
+        default=configs.server.ROLE,
+        help="api - HTTP only, worker - queue processing only, all - both in one process.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=configs.server.WORKERS,
+        help="Number of processes for the selected role.",
+    )
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="Disable the reloader regardless of MANAGER_DEBUG_MODE.",
+    )
+    return parser.parse_args()
+
+
+def _run_worker(index: int) -> None:
+    import worker
+
+    # * Каждому процессу обработчика нужен свой порт метрик
+    if configs.worker.METRICS_PORT:
+        configs.worker.METRICS_PORT += index
+
+    worker.run()
+
+
+def run_workers(count: int) -> None:
+    """Запускает `count` процессов обработчика очереди и передает им сигналы остановки.
+
+    Args:
+        count (int): Количество процессов.
+    """
+    if count == 1:
+        _run_worker(0)
+        return
+
+    processes = [
+        multiprocessing.Process(target=_run_worker, args=(index,), name=f"worker-{index}")
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum: int, _) -> None:
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+
+    for process in processes:
+        process.join()
+
+
+def run_api(role: str, workers: int, production: bool) -> None:
+    """Запускает HTTP сервер. В роли `api` обработчик очереди в процессах API отключается.
+
+    Args:
+        role (str): Роль процесса, `api` или `all`.
+        workers (int): Количество процессов uvicorn.
+        production (bool): Режим без перезагрузки при изменении кода.
+    """
+    if role == "api":
+        # * Переменная окружения наследуется дочерними процессами uvicorn
+        os.environ["MANAGER_WORKER_EMBEDDED"] = "False"
+        configs.worker.EMBEDDED = False
+
+    reload = configs.DEBUG_MODE and not production and workers == 1
     uvicorn.run(
         "app:service",
-        host="0.0.0.0",
-        port=8064,
-        reload=configs.DEBUG_MODE,
+        host=configs.server.HOST,
+        port=configs.server.PORT,
+        workers=None if reload else workers,
+        reload=reload,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
         date_header=True,
         use_colors=True,
     )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.role == "worker":
+        run_workers(args.workers)
+    else:
+        run_api(args.role, args.workers, args.production)
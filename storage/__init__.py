@@ -0,0 +1,3 @@
+from .blobs import PREPROCESSED_BLOB, UPLOAD_BLOB, BlobStorage, blobs
+
+__all__ = ("PREPROCESSED_BLOB", "UPLOAD_BLOB", "BlobStorage", "blobs")
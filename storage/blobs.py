@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Any, BinaryIO
+from uuid import UUID
+
+from configs import configs
+
+UPLOAD_BLOB = "upload"
+PREPROCESSED_BLOB = "preprocessed"
+
+
+class BlobStorage:
+    """Файловое хранилище бинарных данных задач.
+
+    Каждой задаче соответствует отдельная директория, в которой
+    хранятся именованные блобы (исходный аудиофайл и т.п.). При
+    разделении API и обработчиков по разным узлам директория должна
+    располагаться на общем томе.
+    """
+
+    def __init__(self, root: str, chunk_size: int) -> None:
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+
+    def path(self, task_id: UUID, name: str) -> Path:
+        """Возвращает путь к блобу задачи.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            name (str): Имя блоба.
+
+        Returns:
+            Path: Путь к файлу блоба.
+        """
+        return self.root / str(task_id) / name
+
+    def _write(self, target: Path, source: BinaryIO) -> str:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source.seek(0)
+        digest = hashlib.sha256()
+        with target.open("wb") as file:
+            while chunk := source.read(self.chunk_size):
+                digest.update(chunk)
+                file.write(chunk)
+
+        return digest.hexdigest()
+
+    async def save(self, task_id: UUID, name: str, source: BinaryIO) -> str:
+        """Копирует содержимое файлового объекта в блоб задачи.
+        Копирование выполняется частями в отдельном потоке, поэтому
+        файл не загружается в память целиком.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            name (str): Имя блоба.
+            source (BinaryIO): Файловый объект с данными.
+
+        Returns:
+            str: SHA-256 хеш содержимого блоба.
+        """
+        return await asyncio.to_thread(self._write, self.path(task_id, name), source)
+
+    async def save_metadata(self, task_id: UUID, name: str, metadata: dict[str, Any]) -> None:
+        """Сохраняет метаданные блоба задачи рядом с ним.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            name (str): Имя блоба.
+            metadata (dict[str, Any]): Метаданные блоба.
+        """
+        target = self.path(task_id, f"{name}.json")
+        await asyncio.to_thread(target.write_text, json.dumps(metadata))
+
+    def read_metadata(self, task_id: UUID, name: str) -> dict[str, Any]:
+        """Читает метаданные блоба задачи.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            name (str): Имя блоба.
+
+        Returns:
+            dict[str, Any]: Метаданные блоба или пустой словарь, если их нет.
+        """
+        target = self.path(task_id, f"{name}.json")
+        if not target.exists():
+            return {}
+
+        return json.loads(target.read_text())
+
+    def create(self, task_id: UUID, name: str) -> BinaryIO:
+        """Создает блоб задачи и открывает его на запись частями.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            name (str): Имя блоба.
+
+        Returns:
+            BinaryIO: Файловый объект блоба.
+        """
+        target = self.path(task_id, name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return target.open("wb")
+
+    def open(self, task_id: UUID, name: str) -> BinaryIO:
+        """Открывает блоб задачи на чтение без загрузки в память.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            name (str): Имя блоба.
+
+        Returns:
+            BinaryIO: Файловый объект блоба.
+        """
+        return self.path(task_id, name).open("rb")
+
+    async def delete(self, task_id: UUID) -> None:
+        """Удаляет все блобы задачи.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+        """
+        directory = self.root / str(task_id)
+        await asyncio.to_thread(shutil.rmtree, directory, ignore_errors=True)
+
+
+blobs = BlobStorage(configs.storage.PATH, configs.storage.CHUNK_SIZE)
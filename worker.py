@@ -0,0 +1,50 @@
+import asyncio
+import signal
+from importlib.util import find_spec
+
+from configs import configs
+from database import disconnect_db
+from database.notifications import task_events
+from jobs import Worker
+from routers.utils.http_proxy import close_clients
+from service_logging import logger
+from service_metrics import registry, serve_metrics
+
+
+async def main():
+    worker = Worker(configs.worker.CONCURRENCY, configs.worker.POLL_INTERVAL)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    metrics_server = None
+    if configs.worker.METRICS_PORT:
+        metrics_server = await serve_metrics(registry.render, configs.worker.METRICS_PORT)
+
+    # * Через соединение слушателя рассылаются промежуточные статусы задач
+    task_events.start()
+    try:
+        await worker.run()
+    finally:
+        await task_events.stop()
+        if metrics_server:
+            metrics_server.close()
+        await close_clients()
+        await disconnect_db()
+        await logger.complete()
+
+
+def run() -> None:
+    """Запускает обработчик очереди в текущем процессе, используя uvloop, если он установлен."""
+    loop_factory = None
+    if find_spec("uvloop") is not None:
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+
+    asyncio.run(main(), loop_factory=loop_factory)
+
+
+if __name__ == "__main__":
+    run()